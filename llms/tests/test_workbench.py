@@ -0,0 +1,24 @@
+"""In-process tests for workbench.main().
+
+workbench imports terminal_output as a top-level module, so the pyutils
+package directory and llms/ are put on sys.path before importing it.
+
+Run: python -m pytest llms/tests -q
+"""
+
+import sys
+from pathlib import Path
+
+LLMS_DIRECTORY = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(LLMS_DIRECTORY.parent / "pyutils" / "src" / "pyutils"))
+sys.path.insert(0, str(LLMS_DIRECTORY))
+
+import workbench  # noqa: E402
+
+
+def test_dry_run_returns_exit_code_and_can_run_twice_in_process(capsys):
+    assert workbench.main(["--dry-run", "first prompt"]) == 0
+    assert workbench.main(["--dry-run", "second prompt"]) == 0
+    captured = capsys.readouterr()
+    assert captured.out.count("DRY RUN") == 2
+    assert "second prompt" in captured.out
@@ -2,6 +2,7 @@
 # requires-python = ">=3.12"
 # dependencies = [
 #     "anthropic",
+#     "orjson",
 # ]
 # ///
 
@@ -10,15 +11,17 @@
 Pipeline:
     PARSE    -- read CLI arguments, resolve model config, validate flags
     INPUT    -- get prompt text from argument or stdin (single-shot only)
-    ASSEMBLE -- initialize messages array with optional system prompt
-    DRY-RUN  -- if --dry-run, show context and cost estimate, then exit
+    ASSEMBLE -- initialize messages array, resolve optional system prompt
+    DRY-RUN  -- if --dry-run, show context and cost estimate, then return
     INIT     -- connect to SQLite, create/migrate table, create API client
-    LOOP     -- read input, call API, display response, log to database
+    LOOP     -- read input, call API (streamed), display response, log to database
                (single-shot: one iteration; interactive: until /quit or Ctrl-C)
     CLEANUP  -- close database connection, print session summary
 
 Data contracts:
-    messages        -- list[dict] with keys: role (system|user|assistant), content
+    messages        -- list[dict] with keys: role (user|assistant), content;
+                       the system prompt is held separately and stored as
+                       the first entry of messages_json
     response_data   -- dict with keys: response_text, tokens_in, tokens_out,
                        model, stop_reason
     calls table     -- append-only, one row per turn, full context in
@@ -73,21 +76,40 @@ Data contracts:
 #   terminal_output.emit(terminal_output.format_tree(tree_nodes, current=current_leaf))
 
 import argparse
+import functools
 import json
 import os
-import readline  # noqa: F401 -- enhances input() with line editing and history
-import shutil
-import sqlite3
-import subprocess
 import sys
-import tempfile
+from collections.abc import Iterable, Iterator
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
-import anthropic
 import terminal_output
 
+if TYPE_CHECKING:
+    import sqlite3
+
+# orjson serializes messages_json several times faster than json; the
+# fallback emits the same compact, non-ASCII-escaped text without it.
+try:
+    import orjson
+
+    def dumps_json(value: object) -> str:
+        """Serialize value to compact JSON text."""
+        return orjson.dumps(value).decode()
+
+except ImportError:
+
+    def dumps_json(value: object) -> str:
+        """Serialize value to compact JSON text."""
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+# anthropic, sqlite3, readline and the pager modules are imported in the
+# stage that first needs them, so --help, --dry-run and argument errors
+# never pay for the SDK import.
+
 
 # -- Constants ---------------------------------------------------------
 
@@ -95,6 +117,18 @@ DATABASE_PATH: str = str(Path(__file__).parent / "workbench.db")
 
 MAX_RESPONSE_TOKENS: int = 4096
 
+# Bump when the calls table changes; stored in PRAGMA user_version
+SCHEMA_VERSION: int = 2
+
+# One SQL text for every flush so sqlite3's statement cache reuses the
+# prepared statement across the session
+INSERT_CALL_SQL: str = """
+    INSERT INTO calls (timestamp, model, messages_json,
+                       response_text, tokens_in, tokens_out,
+                       notes, conversation_id, stop_reason)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 MODELS: dict[str, dict] = {
     "sonnet": {"id": "claude-sonnet-4-20250514", "cost_in": 3.00, "cost_out": 15.00},
     "haiku": {"id": "claude-haiku-4-5-20251001", "cost_in": 0.80, "cost_out": 4.00},
@@ -106,54 +140,118 @@ DEFAULT_MODEL: str = "haiku"
 
 # -- Argument Parsing --------------------------------------------------
 
-parser = argparse.ArgumentParser(description="Personal LLM Workbench")
-
-parser.add_argument(
-    "text", nargs="?", default=None, help="Prompt text (reads stdin if omitted)"
-)
-parser.add_argument(
-    "--model",
-    "-m",
-    choices=MODELS.keys(),
-    default=DEFAULT_MODEL,
-    help="Model to use (default: haiku)",
-)
-parser.add_argument("--system", "-s", type=str, default=None, help="System prompt text")
-parser.add_argument(
-    "--interactive",
-    "-i",
-    action="store_true",
-    help="Start an interactive multi-turn conversation",
-)
-parser.add_argument(
-    "--dry-run",
-    action="store_true",
-    help="Preview context and cost without calling the API",
-)
-parser.add_argument(
-    "--notes", "-n", type=str, default=None, help="Freeform note stored with each turn"
-)
-parser.add_argument(
-    "--prompt", type=Path, default=None, help="Read system prompt from file"
-)
-parser.add_argument(
-    "--input", type=Path, default=None, help="(placeholder -- not yet implemented)"
-)
-parser.add_argument(
-    "--verbose",
-    "-v",
-    action="count",
-    default=3,
-    help="Increase verbosity (-v debug, -vv trace)",
-)
+
+@functools.cache
+def get_parser() -> argparse.ArgumentParser:
+    """Build the CLI parser on first use; importing the module skips it."""
+    parser = argparse.ArgumentParser(description="Personal LLM Workbench")
+
+    parser.add_argument(
+        "text", nargs="?", default=None, help="Prompt text (reads stdin if omitted)"
+    )
+    parser.add_argument(
+        "--model",
+        "-m",
+        choices=MODELS.keys(),
+        default=DEFAULT_MODEL,
+        help="Model to use (default: haiku)",
+    )
+    parser.add_argument(
+        "--system", "-s", type=str, default=None, help="System prompt text"
+    )
+    parser.add_argument(
+        "--interactive",
+        "-i",
+        action="store_true",
+        help="Start an interactive multi-turn conversation",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Preview context and cost without calling the API",
+    )
+    parser.add_argument(
+        "--count-tokens",
+        action="store_true",
+        help="With --dry-run, get exact input tokens from the token-counting API",
+    )
+    parser.add_argument(
+        "--notes",
+        "-n",
+        type=str,
+        default=None,
+        help="Freeform note stored with each turn",
+    )
+    parser.add_argument(
+        "--prompt", type=Path, default=None, help="Read system prompt from file"
+    )
+    parser.add_argument(
+        "--input", type=Path, default=None, help="(placeholder -- not yet implemented)"
+    )
+    parser.add_argument(
+        "--verbose",
+        "-v",
+        action="count",
+        default=3,
+        help="Increase verbosity (-v debug, -vv trace)",
+    )
+    return parser
+
+
+# -- Display -----------------------------------------------------------
+
+
+def iter_wrapped_lines(text_chunks: Iterable[str], width: int) -> Iterator[str]:
+    """Yield wrapped display lines as each source line completes in the stream."""
+    # wrap_text works line by line, so wrapping each completed line matches
+    # wrapping the whole response at once.
+    partial_line: str = ""
+    for text_chunk in text_chunks:
+        partial_line = partial_line + text_chunk
+        *complete_lines, partial_line = partial_line.split("\n")
+        for line in complete_lines:
+            yield from terminal_output.wrap_text(line, width=width).split("\n")
+    yield from terminal_output.wrap_text(partial_line, width=width).split("\n")
+
+
+# -- Logging -----------------------------------------------------------
+
+
+def flush_pending_calls(
+    connection: "sqlite3.Connection", pending_calls: list[tuple]
+) -> bool:
+    """Insert pending call rows in one transaction; return False on failure.
+
+    Rows are cleared only once committed, so a failed write keeps them for
+    the next attempt instead of dropping them.
+    """
+    import sqlite3
+
+    if not pending_calls:
+        return True
+    try:
+        with connection:
+            connection.executemany(INSERT_CALL_SQL, pending_calls)
+    except sqlite3.Error as database_error:
+        terminal_output.msg_error("Database write failed: " + str(database_error))
+        return False
+    pending_calls.clear()
+    return True
 
 
 # -- Procedural Flow ---------------------------------------------------
 
-if __name__ == "__main__":
+
+def main(argv: list[str] | None = None) -> int:
+    """Run one workbench session and return its exit code.
+
+    argv defaults to sys.argv[1:]. Returning instead of exiting lets a
+    driver call main() repeatedly in one process; argparse usage errors
+    still raise SystemExit.
+    """
     # -- PARSE ---------------------------------------------------------
 
-    parsed_arguments = parser.parse_args()
+    parsed_arguments = get_parser().parse_args(argv)
     terminal_output.set_verbosity(parsed_arguments.verbose)
 
     if parsed_arguments.input is not None:
@@ -161,26 +259,34 @@ if __name__ == "__main__":
 
     if parsed_arguments.prompt is not None and parsed_arguments.system is not None:
         terminal_output.msg_error("Cannot use both --prompt and --system. Choose one.")
-        sys.exit(1)
+        return 1
 
     interactive_mode: bool = parsed_arguments.interactive
     model_name: str = parsed_arguments.model
     model_config: dict = MODELS[model_name]
+    model_id: str = model_config["id"]
+    # Prices are per million tokens; convert once to per-token rates
+    cost_per_token_in: float = model_config["cost_in"] * 1e-6
+    cost_per_token_out: float = model_config["cost_out"] * 1e-6
     # Derive short model name for prompt display
-    model_short: str = model_config["id"].split("/")[-1]
+    model_short: str = model_id.split("/")[-1]
 
     if len(model_short) > 20:
         model_short = model_short[:17] + "..."
 
     if parsed_arguments.dry_run and interactive_mode:
         terminal_output.msg_error("--dry-run is not compatible with --interactive.")
-        sys.exit(1)
+        return 1
+
+    if parsed_arguments.count_tokens and not parsed_arguments.dry_run:
+        terminal_output.msg_error("--count-tokens requires --dry-run.")
+        return 1
 
     if interactive_mode and not sys.stdin.isatty():
         terminal_output.msg_error(
             "Interactive mode requires a terminal (stdin is not a tty)."
         )
-        sys.exit(1)
+        return 1
 
     # -- INPUT ---------------------------------------------------------
 
@@ -197,7 +303,7 @@ if __name__ == "__main__":
         terminal_output.msg_error(
             "No input provided. Pass text as an argument or pipe via stdin."
         )
-        sys.exit(1)
+        return 1
 
     # -- ASSEMBLE ------------------------------------------------------
 
@@ -209,98 +315,164 @@ if __name__ == "__main__":
             system_prompt_text = parsed_arguments.prompt.read_text()
         except (FileNotFoundError, PermissionError, OSError) as file_error:
             terminal_output.msg_error("Failed to read prompt file: " + str(file_error))
-            sys.exit(1)
+            return 1
     elif parsed_arguments.system is not None:
         system_prompt_text = parsed_arguments.system
 
+    # The system prompt stays out of messages so each CALL passes the list
+    # to the API as-is instead of rescanning it for the system entry.
+    system_messages: list[dict[str, str]] = []
     if system_prompt_text is not None:
-        messages.append({"role": "system", "content": system_prompt_text})
+        system_messages.append({"role": "system", "content": system_prompt_text})
 
     # -- DRY-RUN -------------------------------------------------------
 
     if parsed_arguments.dry_run:
-        dry_run_messages: list[dict[str, str]] = messages + [
+        dry_run_messages: list[dict[str, str]] = system_messages + [
             {"role": "user", "content": user_input}
         ]
 
+        # The len // 4 heuristic is free; --count-tokens asks the API's
+        # token-counting endpoint (no message is sent) for the exact figure.
+        estimate_marker: str = "~"
         estimated_input_tokens: int = 0
-        for message in dry_run_messages:
-            estimated_input_tokens = (
-                estimated_input_tokens + len(message["content"]) // 4
-            )
+        if parsed_arguments.count_tokens:
+            import anthropic
+
+            count_kwargs: dict = {
+                "model": model_id,
+                "messages": [{"role": "user", "content": user_input}],
+            }
+            if system_prompt_text is not None:
+                count_kwargs["system"] = system_prompt_text
+            try:
+                estimated_input_tokens = (
+                    anthropic.Anthropic()
+                    .messages.count_tokens(**count_kwargs)
+                    .input_tokens
+                )
+            except anthropic.APIError as api_error:
+                terminal_output.msg_error("Token count failed: " + str(api_error))
+                return 1
+            estimate_marker = ""
+        else:
+            for message in dry_run_messages:
+                estimated_input_tokens = (
+                    estimated_input_tokens + len(message["content"]) // 4
+                )
 
-        estimated_input_cost: float = (
-            estimated_input_tokens / 1_000_000
-        ) * model_config["cost_in"]
+        estimated_input_cost: float = estimated_input_tokens * cost_per_token_in
 
         summary_lines: list[str] = [
-            "Model: " + model_config["id"],
-            "Messages: " + str(len(dry_run_messages)),
-            "Estimated input tokens: ~" + str(estimated_input_tokens),
-            "Estimated cost: ~" + terminal_output.format_cost(estimated_input_cost),
+            f"Model: {model_id}",
+            f"Messages: {len(dry_run_messages)}",
+            f"Input tokens: {estimate_marker}{estimated_input_tokens}",
+            f"Input cost: {estimate_marker}"
+            + terminal_output.format_cost(estimated_input_cost),
         ]
         print(terminal_output.format_block("DRY RUN", "\n".join(summary_lines)))
 
-        context_lines: list[str] = []
-        for message in dry_run_messages:
-            role_label: str = terminal_output.format_label(message["role"])
-            context_lines.append(role_label + " " + message["content"])
+        context_lines: list[str] = [
+            f"{terminal_output.format_label(message['role'])} {message['content']}"
+            for message in dry_run_messages
+        ]
         print(terminal_output.format_block("CONTEXT", "\n\n".join(context_lines)))
 
-        terminal_output.msg_info("No API call made.")
-        sys.exit(0)
+        terminal_output.msg_info("No message sent.")
+        return 0
 
     # -- INIT ----------------------------------------------------------
 
+    import sqlite3
+
     connection = sqlite3.connect(DATABASE_PATH)
-    with connection:
-        connection.execute("""
-            CREATE TABLE IF NOT EXISTS calls (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                model TEXT NOT NULL,
-                messages_json TEXT NOT NULL,
-                response_text TEXT NOT NULL,
-                tokens_in INTEGER,
-                tokens_out INTEGER,
-                notes TEXT,
-                conversation_id TEXT,
-                stop_reason TEXT
+    # WAL + synchronous=NORMAL drops the per-commit journal fsync; the rest
+    # keeps temp tables, page cache, and reads in memory. Outside any
+    # transaction, since journal_mode cannot change inside one.
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.execute("PRAGMA temp_store=MEMORY")
+    connection.execute("PRAGMA cache_size=-64000")
+    connection.execute("PRAGMA mmap_size=268435456")
+    # Schema setup runs only when user_version lags SCHEMA_VERSION, so a
+    # current database pays one PRAGMA read instead of CREATE + ALTER probes.
+    schema_version: int = connection.execute("PRAGMA user_version").fetchone()[0]
+    if schema_version < SCHEMA_VERSION:
+        with connection:
+            connection.execute("BEGIN")
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS calls (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    messages_json TEXT NOT NULL,
+                    response_text TEXT NOT NULL,
+                    tokens_in INTEGER,
+                    tokens_out INTEGER,
+                    notes TEXT,
+                    conversation_id TEXT,
+                    stop_reason TEXT
+                )
+            """)
+
+            # Migrate: add conversation_id if table predates this column
+            try:
+                connection.execute("ALTER TABLE calls ADD COLUMN conversation_id TEXT")
+            except sqlite3.OperationalError:
+                pass  # column already exists
+
+            # Migrate: add stop_reason if table predates this column
+            try:
+                connection.execute("ALTER TABLE calls ADD COLUMN stop_reason TEXT")
+            except sqlite3.OperationalError:
+                pass  # column already exists
+
+            # Replay and the Phase 2 branch walk read one conversation in id
+            # order; without this index each such query scans the table.
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_calls_conversation"
+                " ON calls(conversation_id, id)"
             )
-        """)
 
-    # Migrate: add conversation_id if table predates this column
-    try:
-        with connection:
-            connection.execute("ALTER TABLE calls ADD COLUMN conversation_id TEXT")
-    except sqlite3.OperationalError:
-        pass  # column already exists
+            connection.execute("PRAGMA user_version = " + str(SCHEMA_VERSION))
 
-    # Migrate: add stop_reason if table predates this column
-    try:
-        with connection:
-            connection.execute("ALTER TABLE calls ADD COLUMN stop_reason TEXT")
-    except sqlite3.OperationalError:
-        pass  # column already exists
+    import anthropic
 
     try:
         client = anthropic.Anthropic()
     except anthropic.APIError as api_error:
         terminal_output.msg_error("Failed to initialize API client: " + str(api_error))
         connection.close()
-        sys.exit(1)
+        return 1
 
     conversation_id: str | None = None
     if interactive_mode:
+        import readline  # noqa: F401 -- enhances input() with line editing and history
+
         conversation_id = uuid4().hex[:12]
         terminal_output.msg_info(
             "Interactive mode ("
             + terminal_output.format_label("conversation_id", conversation_id)
             + ", "
-            + terminal_output.format_label("model", model_config["id"])
+            + terminal_output.format_label("model", model_id)
             + "). /quit or Ctrl-C to exit."
         )
 
+    # Request arguments are fixed for the session; messages is the same
+    # list object every turn, so the dict always sees the current history.
+    api_kwargs: dict = {
+        "model": model_id,
+        "max_tokens": MAX_RESPONSE_TOKENS,
+        "messages": messages,
+    }
+    if system_prompt_text is not None:
+        api_kwargs["system"] = system_prompt_text
+
+    # Stream responses so text appears as it arrives. Single-shot output on
+    # a terminal is the exception: it waits for the full response so a
+    # long reply can go to the pager.
+    stream_response: bool = interactive_mode or not sys.stdout.isatty()
+
     # -- LAYOUT --------------------------------------------------------
 
     # Set centered layout for interactive terminal sessions only.
@@ -315,220 +487,304 @@ if __name__ == "__main__":
 
     turn_count: int = 0
 
+    # Rows awaiting INSERT: committed every turn, and retried on the next
+    # turn or when the loop ends if a write failed
+    pending_calls: list[tuple] = []
+
+    # JSON text of every message logged so far, reused across turns
+    serialized_messages: list[str] = [
+        dumps_json(message) for message in system_messages
+    ]
+
     # Session accumulators for summary
     total_tokens_in: int = 0
     total_tokens_out: int = 0
     total_cost: float = 0.0
 
-    while True:
-        # Display turn separator
-        terminal_output.emit(
-            terminal_output.format_labeled_separator("turn " + str(turn_count + 1))
-        )
+    try:
+        while True:
+            # Display turn separator
+            terminal_output.emit(
+                terminal_output.format_labeled_separator(f"turn {turn_count + 1}")
+            )
 
-        # Read input
-        if turn_count == 0 and has_initial_input:
-            pass  # user_input already set from argument or stdin
-        else:
-            try:
-                if interactive_mode:
-                    prompt_text: str = terminal_output.apply_style(
-                        "[" + model_short + ":" + str(turn_count + 1) + "] > ",
-                        terminal_output.STYLE_BOLD,
-                    )
-                else:
-                    prompt_text: str = "> "
-                user_input = input(prompt_text)
-            except (KeyboardInterrupt, EOFError):
-                print()
-                if turn_count > 0:
-                    terminal_output.emit(
-                        terminal_output.format_labeled_separator("session")
-                    )
-                    session_metadata: str = terminal_output.format_metadata_inline(
-                        [
-                            ("turns", str(turn_count)),
-                            (
-                                "tokens",
-                                terminal_output.format_token_counts(
-                                    total_tokens_in, total_tokens_out
+            # Read input
+            if turn_count == 0 and has_initial_input:
+                pass  # user_input already set from argument or stdin
+            else:
+                try:
+                    if interactive_mode:
+                        prompt_text: str = terminal_output.apply_style(
+                            f"[{model_short}:{turn_count + 1}] > ",
+                            terminal_output.STYLE_BOLD,
+                        )
+                    else:
+                        prompt_text: str = "> "
+                    user_input = input(prompt_text)
+                except (KeyboardInterrupt, EOFError):
+                    print()
+                    if turn_count > 0:
+                        terminal_output.emit(
+                            terminal_output.format_labeled_separator("session")
+                        )
+                        session_metadata: str = terminal_output.format_metadata_inline(
+                            [
+                                ("turns", str(turn_count)),
+                                (
+                                    "tokens",
+                                    terminal_output.format_token_counts(
+                                        total_tokens_in, total_tokens_out
+                                    ),
                                 ),
-                            ),
-                            ("cost", terminal_output.format_cost(total_cost)),
-                        ]
-                    )
-                    terminal_output.msg_info(session_metadata)
-                break
-            stripped_input: str = user_input.strip()
-
-            if stripped_input == "":
-                continue
-
-            if stripped_input in ("/quit", "/exit"):
-                if turn_count > 0:
-                    terminal_output.emit(
-                        terminal_output.format_labeled_separator("session")
-                    )
-                    session_metadata: str = terminal_output.format_metadata_inline(
-                        [
-                            ("turns", str(turn_count)),
-                            (
-                                "tokens",
-                                terminal_output.format_token_counts(
-                                    total_tokens_in, total_tokens_out
+                                ("cost", terminal_output.format_cost(total_cost)),
+                            ]
+                        )
+                        terminal_output.msg_info(session_metadata)
+                    break
+                stripped_input: str = user_input.strip()
+
+                if stripped_input == "":
+                    continue
+
+                if stripped_input in ("/quit", "/exit"):
+                    if turn_count > 0:
+                        terminal_output.emit(
+                            terminal_output.format_labeled_separator("session")
+                        )
+                        session_metadata: str = terminal_output.format_metadata_inline(
+                            [
+                                ("turns", str(turn_count)),
+                                (
+                                    "tokens",
+                                    terminal_output.format_token_counts(
+                                        total_tokens_in, total_tokens_out
+                                    ),
                                 ),
-                            ),
-                            ("cost", terminal_output.format_cost(total_cost)),
-                        ]
-                    )
-                    terminal_output.msg_info(session_metadata)
-                break
+                                ("cost", terminal_output.format_cost(total_cost)),
+                            ]
+                        )
+                        terminal_output.msg_info(session_metadata)
+                    break
 
-        messages.append({"role": "user", "content": user_input})
+            messages.append({"role": "user", "content": user_input})
 
-        # CALL
-        system_prompt: str | None = None
-        api_messages: list[dict[str, str]] = []
-        for message in messages:
-            if message["role"] == "system":
-                system_prompt = message["content"]
-            else:
-                api_messages.append(message)
-
-        try:
-            if system_prompt is not None:
-                api_response = client.messages.create(
-                    model=model_config["id"],
-                    max_tokens=MAX_RESPONSE_TOKENS,
-                    system=system_prompt,
-                    messages=api_messages,
-                )
-            else:
-                api_response = client.messages.create(
-                    model=model_config["id"],
-                    max_tokens=MAX_RESPONSE_TOKENS,
-                    messages=api_messages,
-                )
-        except anthropic.APIError as api_error:
-            terminal_output.msg_error("API call failed: " + str(api_error))
-            messages.pop()  # remove the failed user message
-            if not interactive_mode:
-                connection.close()
-                sys.exit(1)
-            continue
-
-        # Unpack SDK response to plain data immediately
-        response_data: dict = {
-            "response_text": api_response.content[0].text,
-            "tokens_in": api_response.usage.input_tokens,
-            "tokens_out": api_response.usage.output_tokens,
-            "model": api_response.model,
-            "stop_reason": api_response.stop_reason,
-        }
-
-        messages.append(
-            {"role": "assistant", "content": response_data["response_text"]}
-        )
+            # CALL (and DISPLAY, when streaming)
+            try:
+                if stream_response and not sys.stdout.isatty():
+                    with client.messages.stream(**api_kwargs) as response_stream:
+                        for text_chunk in response_stream.text_stream:
+                            sys.stdout.write(text_chunk)
+                            sys.stdout.flush()
+                        print()
+                        api_response = response_stream.get_final_message()
+                elif stream_response:
+                    import shutil
+                    import subprocess
+
+                    # Wrapped lines print as they complete. Once the reply
+                    # outgrows the terminal, the lines shown so far and the rest
+                    # of the stream go to the pager's stdin, so at most one
+                    # screen of lines is ever held here.
+                    terminal_height: int = shutil.get_terminal_size().lines
+                    shown_lines: list[str] | None = []
+                    pager_process = None
+                    pager_input = None
+                    # The pager is closed and waited on however the stream ends,
+                    # including an APIError mid-reply, so it never outlives the
+                    # turn and competes with the next prompt for the terminal.
+                    try:
+                        with client.messages.stream(**api_kwargs) as response_stream:
+                            for line in iter_wrapped_lines(
+                                response_stream.text_stream, 80
+                            ):
+                                screen_full: bool = (
+                                    shown_lines is not None
+                                    and len(shown_lines) >= terminal_height
+                                )
+                                if screen_full:
+                                    try:
+                                        pager_process = subprocess.Popen(
+                                            os.environ.get("PAGER", "less -R").split(),
+                                            stdin=subprocess.PIPE,
+                                            text=True,
+                                            bufsize=1,
+                                        )
+                                    except (FileNotFoundError, OSError):
+                                        terminal_output.msg_warn(
+                                            "Pager not available, printing directly."
+                                        )
+                                    else:
+                                        pager_input = pager_process.stdin
+                                        try:
+                                            pager_input.write(
+                                                "\n".join(shown_lines) + "\n"
+                                            )
+                                        except BrokenPipeError:
+                                            pager_input = None
+                                    shown_lines = None
+                                if pager_process is None:
+                                    print(line, flush=True)
+                                    if shown_lines is not None:
+                                        shown_lines.append(line)
+                                elif pager_input is not None:
+                                    try:
+                                        pager_input.write(line + "\n")
+                                    except BrokenPipeError:
+                                        # Pager quit early; keep draining for the log
+                                        pager_input = None
+                            api_response = response_stream.get_final_message()
+                    finally:
+                        if pager_process is not None:
+                            try:
+                                pager_process.stdin.close()
+                            except BrokenPipeError:
+                                pass
+                            pager_process.wait()
+                else:
+                    api_response = client.messages.create(**api_kwargs)
+            except anthropic.APIError as api_error:
+                terminal_output.msg_error("API call failed: " + str(api_error))
+                messages.pop()  # remove the failed user message
+                if not interactive_mode:
+                    return 1
+                continue
 
-        # DISPLAY
-        if sys.stdout.isatty():
-            wrapped_response: str = terminal_output.wrap_text(
-                response_data["response_text"], width=80
+            # Unpack SDK response to plain data immediately
+            response_data: dict = {
+                "response_text": api_response.content[0].text,
+                "tokens_in": api_response.usage.input_tokens,
+                "tokens_out": api_response.usage.output_tokens,
+                "model": api_response.model,
+                "stop_reason": api_response.stop_reason,
+            }
+
+            messages.append(
+                {"role": "assistant", "content": response_data["response_text"]}
             )
-            terminal_height: int = shutil.get_terminal_size().lines
-            response_line_count: int = wrapped_response.count("\n") + 1
-
-            if response_line_count > terminal_height:
-                pager_command: str = os.environ.get("PAGER", "less -R")
-                pager_parts: list[str] = pager_command.split()
 
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".md", delete=False
-                ) as pager_file:
-                    pager_file.write(wrapped_response)
-                    pager_file_path: str = pager_file.name
+            # DISPLAY (single-shot on a terminal; streamed output is already shown)
+            if not stream_response:
+                import shutil
 
-                try:
-                    subprocess.run(pager_parts + [pager_file_path])
-                except (FileNotFoundError, OSError):
-                    terminal_output.msg_warn("Pager not available, printing directly.")
-                    print(wrapped_response)
-                finally:
-                    os.unlink(pager_file_path)
-            else:
-                print(wrapped_response)
-        else:
-            print(response_data["response_text"])
-
-        tokens_in: int = response_data["tokens_in"]
-        tokens_out: int = response_data["tokens_out"]
-        input_cost: float = (tokens_in / 1_000_000) * model_config["cost_in"]
-        output_cost: float = (tokens_out / 1_000_000) * model_config["cost_out"]
-        turn_cost: float = input_cost + output_cost
-
-        # Update session accumulators
-        total_tokens_in = total_tokens_in + tokens_in
-        total_tokens_out = total_tokens_out + tokens_out
-        total_cost = total_cost + turn_cost
-
-        # Display turn metadata
-        metadata_line: str = terminal_output.format_metadata_inline(
-            [
-                ("tokens", terminal_output.format_token_counts(tokens_in, tokens_out)),
-                ("cost", terminal_output.format_cost(turn_cost)),
-            ]
-        )
-        terminal_output.msg_info(metadata_line)
+                response_text: str = response_data["response_text"]
+                terminal_height: int = shutil.get_terminal_size().lines
 
-        stop_reason: str = response_data["stop_reason"]
-        if stop_reason == "max_tokens":
-            terminal_output.msg_warn(
-                "Stop reason: " + stop_reason + " (response truncated)"
+                # Each wrapped line but the last consumes at least one character,
+                # so text shorter than both the terminal height and the wrap
+                # width can neither wrap nor need the pager.
+                if len(response_text) < min(terminal_height, 80):
+                    print(response_text)
+                else:
+                    wrapped_response: str = terminal_output.wrap_text(
+                        response_text, width=80
+                    )
+                    response_line_count: int = wrapped_response.count("\n") + 1
+
+                    if response_line_count > terminal_height:
+                        import subprocess
+
+                        pager_command: str = os.environ.get("PAGER", "less -R")
+                        pager_parts: list[str] = pager_command.split()
+
+                        # Feed the pager through its stdin: no temp file to write
+                        # and unlink. communicate() ignores the broken pipe when
+                        # the pager is quit before reading everything.
+                        try:
+                            pager_process = subprocess.Popen(
+                                pager_parts, stdin=subprocess.PIPE, text=True
+                            )
+                        except (FileNotFoundError, OSError):
+                            terminal_output.msg_warn(
+                                "Pager not available, printing directly."
+                            )
+                            print(wrapped_response)
+                        else:
+                            pager_process.communicate(wrapped_response)
+                    else:
+                        print(wrapped_response)
+
+            tokens_in: int = response_data["tokens_in"]
+            tokens_out: int = response_data["tokens_out"]
+            turn_cost: float = (
+                tokens_in * cost_per_token_in + tokens_out * cost_per_token_out
             )
-        else:
-            terminal_output.msg_debug("Stop reason: " + stop_reason)
 
-        # LOG
-        timestamp: str = datetime.now(timezone.utc).isoformat()
-        messages_json: str = json.dumps(messages)
+            # Update session accumulators
+            total_tokens_in = total_tokens_in + tokens_in
+            total_tokens_out = total_tokens_out + tokens_out
+            total_cost = total_cost + turn_cost
 
-        try:
-            with connection:
-                connection.execute(
-                    """
-                    INSERT INTO calls (timestamp, model, messages_json,
-                                       response_text, tokens_in, tokens_out,
-                                       notes, conversation_id, stop_reason)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
+            # Display turn metadata
+            metadata_line: str = terminal_output.format_metadata_inline(
+                [
                     (
-                        timestamp,
-                        model_config["id"],
-                        messages_json,
-                        response_data["response_text"],
-                        tokens_in,
-                        tokens_out,
-                        parsed_arguments.notes,
-                        conversation_id,
-                        stop_reason,
+                        "tokens",
+                        terminal_output.format_token_counts(tokens_in, tokens_out),
                     ),
+                    ("cost", terminal_output.format_cost(turn_cost)),
+                ]
+            )
+            terminal_output.msg_info(metadata_line)
+
+            stop_reason: str = response_data["stop_reason"]
+            if stop_reason == "max_tokens":
+                terminal_output.msg_warn(
+                    "Stop reason: " + stop_reason + " (response truncated)"
                 )
-        except sqlite3.Error as database_error:
-            terminal_output.msg_error("Database write failed: " + str(database_error))
-            if not interactive_mode:
-                connection.close()
-                sys.exit(1)
+            else:
+                terminal_output.msg_debug("Stop reason: " + stop_reason)
+
+            # LOG
+            timestamp: str = datetime.now(timezone.utc).isoformat()
+            # Serialize only this turn's user and assistant messages; the
+            # joined text matches dumps_json of the full context without
+            # re-encoding history.
+            serialized_messages.extend(dumps_json(message) for message in messages[-2:])
+            messages_json: str = "[" + ",".join(serialized_messages) + "]"
+
+            pending_calls.append(
+                (
+                    timestamp,
+                    model_id,
+                    messages_json,
+                    response_data["response_text"],
+                    tokens_in,
+                    tokens_out,
+                    parsed_arguments.notes,
+                    conversation_id,
+                    stop_reason,
+                )
+            )
 
-        turn_count = turn_count + 1
+            # Commit every turn: with WAL and synchronous=NORMAL a commit
+            # costs no fsync, and a turn already shown to the user is on disk
+            # even if the terminal is closed (SIGHUP) before the session ends.
+            if (
+                not flush_pending_calls(connection, pending_calls)
+                and not interactive_mode
+            ):
+                return 1
 
-        if not interactive_mode:
-            break
+            turn_count = turn_count + 1
 
-    # -- CLEANUP -------------------------------------------------------
+            if not interactive_mode:
+                break
+    finally:
+        # Runs on break, return and Ctrl-C alike: retries any row a failed
+        # write left behind, then closes the connection, without an exit
+        # hook that would outlive this call.
+        flush_pending_calls(connection, pending_calls)
+        connection.close()
 
-    connection.close()
+    # -- CLEANUP -------------------------------------------------------
 
     if interactive_mode and turn_count > 0:
         terminal_output.msg_info("Session ended. " + str(turn_count) + " turns logged.")
     elif not interactive_mode and turn_count > 0:
         terminal_output.msg_success("Logged to " + DATABASE_PATH)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
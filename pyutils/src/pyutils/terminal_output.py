@@ -33,6 +33,7 @@ CALLER CONVENTION (COMPLETE)
 
   terminal_output.emit(format_card(...))     # formatted content -> stdout
   terminal_output.emit(format_choices(...))  # formatted content -> stdout
+  terminal_output.emit_many(cards)           # several blocks -> stdout, one write
   print(raw_data)                            # piped data -> stdout, no layout
 
   terminal_output.msg_info("status")         # diagnostics -> stderr
@@ -43,10 +44,16 @@ Use fully qualified calls throughout: terminal_output.emit(), not
 from terminal_output import emit.
 """
 
+import atexit
+import bisect
+import functools
+import itertools
 import os
 import re
+import signal
 import sys
 import textwrap
+from collections.abc import Callable, Iterable, Iterator
 
 # ============================================================================
 # Section 1: Color state and style constants
@@ -57,6 +64,7 @@ import textwrap
 # override it at any time -- the injection point for tests and embedding
 # programs. STYLE_* remain module attributes for API compatibility; access
 # them fully qualified (terminal_output.STYLE_RED) so overrides are seen.
+# The same holds for apply_style, which set_color() rebinds.
 
 STDERR_IS_TERMINAL: bool = sys.stderr.isatty()
 VERBOSITY: int = 3  # default: show error, warn, info
@@ -77,6 +85,18 @@ _ANSI_CODES: dict[str, str] = {
 STYLE_RESET = STYLE_BOLD = STYLE_DIM = STYLE_RED = STYLE_YELLOW = ""
 STYLE_CYAN = STYLE_GRAY = STYLE_GREEN = STYLE_BOLD_YELLOW = ""
 
+# Mirrors the current set_color() state so hot paths can skip styling work
+# outright when every STYLE_* constant is empty (pipes, CI, log capture).
+_styling_enabled: bool = False
+
+# Prebuilt styled tokens, rebuilt by set_color(): the per-row format_card
+# border, and the reset-plus-newline that ends every message line.
+_DIM_PIPE: str = "|"
+_LINE_END: str = "\n"
+
+# Styled "[name]" flag labels by name (format_label_flag); cleared by set_color().
+_label_flag_cache: dict[str, str] = {}
+
 
 def _detect_color_default() -> bool:
     if os.environ.get("NO_COLOR"):
@@ -84,15 +104,52 @@ def _detect_color_default() -> bool:
     return sys.stdout.isatty() and sys.stderr.isatty()
 
 
+def _apply_style_ansi(text: str, style_code: str) -> str:
+    """Apply an ANSI style code to text.
+
+    This is the only function that concatenates ANSI codes.
+    All other styling functions call this, as apply_style -- the name
+    set_color() binds to this function while styling is enabled, and to
+    _apply_style_plain while it is disabled, so the disabled case does no
+    per-call checking at all.
+
+    Args:
+        text: Plain string to style
+        style_code: One of the STYLE_* constants
+
+    Returns:
+        Styled string if style_code is non-empty, otherwise plain text
+    """
+    if not style_code:
+        return text
+    return f"{style_code}{text}{STYLE_RESET}"
+
+
+def _apply_style_plain(text: str, style_code: str) -> str:
+    """apply_style while styling is disabled: return text unchanged.
+
+    See _apply_style_ansi for the full contract."""
+    return text
+
+
+apply_style: Callable[[str, str], str] = _apply_style_plain
+
+
 def set_color(enabled: bool | None = None) -> None:
     """Enable or disable ANSI styling for all formatters and messages.
 
     enabled=True/False forces the state; enabled=None re-runs detection
     (NO_COLOR, stdout+stderr tty check). Call once at startup, or from
     tests to make output deterministic."""
+    global _styling_enabled, _DIM_PIPE, _LINE_END, apply_style
     state = _detect_color_default() if enabled is None else enabled
     for name, code in _ANSI_CODES.items():
-        globals()[name] = code if state else ""
+        globals()[name] = sys.intern(code) if state else ""
+    _styling_enabled = bool(state)
+    apply_style = _apply_style_ansi if state else _apply_style_plain
+    _DIM_PIPE = f"{STYLE_DIM}|{STYLE_RESET}" if state else "|"
+    _LINE_END = STYLE_RESET + "\n"
+    _label_flag_cache.clear()
 
 
 set_color(None)
@@ -160,18 +217,54 @@ def set_verbosity(level: int) -> None:
     VERBOSITY = level
 
 
+_buffer_messages: bool = False
+_message_buffer: list[str] = []
+_MESSAGE_BUFFER_LIMIT: int = 64
+
+
+def set_message_buffering(enabled: bool) -> None:
+    """Batch msg_*() output into fewer stderr writes, or write each at once.
+
+    Off by default: every message is written as it happens. A script that
+    logs heavily to a file or pipe can opt in with enabled=True. Buffered
+    lines are written every _MESSAGE_BUFFER_LIMIT messages, as soon as an
+    error or warning arrives, by flush_messages(), and at interpreter exit.
+    Pending lines are flushed before the state changes.
+
+    While buffering, queued lines can land after stdout output or after an
+    uncaught exception's traceback, and are lost if the process is killed
+    or exits via os._exit -- call flush_messages() at points that matter.
+    """
+    global _buffer_messages
+    flush_messages()
+    _buffer_messages = enabled
+
+
 # ============================================================================
 # Section 3: Primitive Layer
 # ============================================================================
 _cached_terminal_width: int | None = None
 _ANSI_PATTERN: re.Pattern = re.compile(r"\033\[[0-9;]*m")
+_SPACES: str = " " * 1024
+
+
+def _pad(count: int) -> str:
+    """Return count spaces, sliced from a shared pool rather than multiplied.
+
+    Non-positive counts return "" (same as " " * count); counts beyond the
+    pool fall back to multiplication.
+    """
+    if 0 <= count <= 1024:
+        return _SPACES[:count]
+    return " " * count
 
 
 def get_terminal_width() -> int:
-    """Return terminal column count, cached after first call.
+    """Return terminal column count, cached until the terminal is resized.
 
-    Detects once via os.get_terminal_size(). Falls back to 80 if detection
-    fails (piped output, non-terminal environments).
+    Detects via os.get_terminal_size() on first call, and again after a
+    SIGWINCH once enable_resize_tracking() has been called. Falls back to
+    80 if detection fails (piped output, non-terminal environments).
 
     Returns:
         Integer column count.
@@ -185,6 +278,29 @@ def get_terminal_width() -> int:
     return _cached_terminal_width
 
 
+def _invalidate_terminal_width(signal_number: int, frame: object) -> None:
+    global _cached_terminal_width
+    _cached_terminal_width = None
+
+
+def enable_resize_tracking() -> bool:
+    """Re-detect the terminal width after each SIGWINCH.
+
+    Opt-in because it installs a process-wide signal handler: call it only
+    from a script that owns the terminal. Handlers installed from C (e.g.
+    by readline or curses) are invisible to signal.getsignal() and would be
+    replaced, so do not combine it with those. Must run on the main thread.
+
+    Returns:
+        True if the handler was installed, False where SIGWINCH does not
+        exist (Windows).
+    """
+    if not hasattr(signal, "SIGWINCH"):
+        return False
+    signal.signal(signal.SIGWINCH, _invalidate_terminal_width)
+    return True
+
+
 def measure_width(text: str) -> int:
     """Return visible character count, ignoring ANSI SGR escape sequences.
 
@@ -240,10 +356,16 @@ def align_text(text: str, align: str = "left", width: int | None = None) -> str:
         return text
     lines: list[str] = text.split("\n")
     maximum_width: int = 0
-    for line in lines:
-        line_visible_width: int = measure_width(line)
-        if line_visible_width > maximum_width:
-            maximum_width = line_visible_width
+    if "\033" not in text:
+        # No escape codes: visible width is plain len(), no regex needed.
+        # (Raw len is only an upper bound on styled text, so it cannot be
+        # used to early-return there.)
+        maximum_width = max(map(len, lines))
+    else:
+        for line in lines:
+            line_visible_width: int = measure_width(line)
+            if line_visible_width > maximum_width:
+                maximum_width = line_visible_width
     if maximum_width >= width:
         return text
     if align == "center":
@@ -252,7 +374,7 @@ def align_text(text: str, align: str = "left", width: int | None = None) -> str:
         padding = width - maximum_width
     else:
         return text
-    prefix: str = " " * padding
+    prefix: str = _pad(padding)
     padded_lines: list[str] = []
     for line in lines:
         padded_lines.append(prefix + line)
@@ -264,22 +386,8 @@ def align_text(text: str, align: str = "left", width: int | None = None) -> str:
 # ============================================================================
 
 
-def apply_style(text: str, style_code: str) -> str:
-    """Apply an ANSI style code to text.
-
-    This is the only function that concatenates ANSI codes.
-    All other styling functions call this.
-
-    Args:
-        text: Plain string to style
-        style_code: One of the STYLE_* constants
-
-    Returns:
-        Styled string if style_code is non-empty, otherwise plain text
-    """
-    if not style_code:
-        return text
-    return f"{style_code}{text}{STYLE_RESET}"
+# apply_style(text, style_code) is defined in Section 1: set_color() binds it
+# to the styled or the plain variant there.
 
 
 def format_highlight(text: str) -> str:
@@ -287,7 +395,8 @@ def format_highlight(text: str) -> str:
 
     Semantic function - encodes the meaning "this is highlighted content"
     rather than just "make this bold yellow". Primary use: FTS search
-    match highlighting.
+    match highlighting. Results are memoized, since FTS output highlights
+    the same few query terms across many rows.
 
     Args:
         text: Plain string to highlight
@@ -295,7 +404,14 @@ def format_highlight(text: str) -> str:
     Returns:
         Highlighted string (or plain if terminal styling disabled)
     """
-    return apply_style(text, STYLE_BOLD_YELLOW)
+    return _format_highlight_cached(text, STYLE_BOLD_YELLOW)
+
+
+@functools.lru_cache(maxsize=512)
+def _format_highlight_cached(text: str, style_code: str) -> str:
+    # style_code is part of the key so a set_color() toggle never serves a
+    # result styled under the previous state.
+    return apply_style(text, style_code)
 
 
 def format_label(name: str, value: str | None = None) -> str:
@@ -315,15 +431,33 @@ def format_label(name: str, value: str | None = None) -> str:
         format_label("model", "sonnet") -> "[model: sonnet]"
     """
     if value is None:
-        label_text = f"[{name}]"
-    else:
-        label_text = f"[{name}: {value}]"
-    return apply_style(label_text, STYLE_CYAN)
+        return format_label_flag(name)
+    return format_label_kv(name, value)
+
+
+def format_label_flag(name: str) -> str:
+    """Format a bracketed flag label, "[name]", styled in cyan.
+
+    Flag labels repeat verbatim ("[dry-run]"), so each is built once per
+    name and served from a cache afterwards.
+    """
+    label: str | None = _label_flag_cache.get(name)
+    if label is None:
+        label = _label_flag_cache[name] = apply_style(f"[{name}]", STYLE_CYAN)
+    return label
+
+
+def format_label_kv(name: str, value: str) -> str:
+    """Format a bracketed name/value label, "[name: value]", styled in cyan."""
+    return apply_style(f"[{name}: {value}]", STYLE_CYAN)
 
 
 def format_separator(character: str = "-", width: int | None = None) -> str:
     """Generate a separator line of repeated characters.
 
+    Results are memoized; a process renders only a handful of distinct
+    separators, usually many times each.
+
     Args:
         character: Single character to repeat (default: "-")
         width: Line width (default: terminal width)
@@ -333,8 +467,13 @@ def format_separator(character: str = "-", width: int | None = None) -> str:
     """
     if width is None:
         width = _get_max_width()
-    separator_line = character * width
-    return apply_style(separator_line, STYLE_DIM)
+    return _format_separator_cached(character, width, STYLE_DIM)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_separator_cached(character: str, width: int, style_code: str) -> str:
+    # style_code keys the cache on the set_color() state, as for highlights.
+    return apply_style(character * width, style_code)
 
 
 def format_token_counts(tokens_in: int, tokens_out: int) -> str:
@@ -402,11 +541,11 @@ def format_block(header: str, content: str) -> str:
         model: sonnet
         -------------------
     """
-    header_separator = apply_style(f"--- {header} ---", STYLE_DIM)
-    header_length = len(f"--- {header} ---")
-    footer_separator = apply_style("-" * header_length, STYLE_DIM)
-    lines = [header_separator, content, footer_separator]
-    return "\n".join(lines)
+    header_line = f"--- {header} ---"
+    footer_line = "-" * len(header_line)
+    if not _styling_enabled:
+        return f"{header_line}\n{content}\n{footer_line}"
+    return f"{STYLE_DIM}{header_line}{STYLE_RESET}\n{content}\n{STYLE_DIM}{footer_line}{STYLE_RESET}"
 
 
 def format_labeled_separator(label: str, character: str = "-", width: int | None = None) -> str:
@@ -521,53 +660,65 @@ def format_card(
     if gap < 2:
         right_styled = ""
         gap = inner - left_visible_width
-    header_line: str = header_left + (" " * gap) + right_styled
-
-    # --- body lines ---
-    body_lines: list[str] = []
-    for paragraph in body.split("\n"):
-        if paragraph.strip() == "":
-            body_lines.append("")
-        else:
-            wrapped: str = wrap_text(paragraph, indent=0, width=inner)
-            for wrapped_line in wrapped.split("\n"):
-                body_lines.append(wrapped_line)
-
-    # --- footer lines ---
-    footer_lines: list[str] = []
-    if footer is not None:
-        wrapped_footer: str = wrap_text(footer, indent=0, width=inner)
-        for footer_line in wrapped_footer.split("\n"):
-            footer_lines.append(apply_style(footer_line, STYLE_DIM))
+    header_line: str = header_left + _pad(gap) + right_styled
 
     # --- assembly helpers ---
+    # The vertical border is prebuilt by set_color(), so rows never restyle it.
     border_horizontal: str = apply_style("+" + ("-" * (width - 2)) + "+", STYLE_DIM)
-    empty_row: str = apply_style("|", STYLE_DIM) + (" " * (width - 2)) + apply_style("|", STYLE_DIM)
+    border_vertical: str = _DIM_PIPE
+    empty_row: str = border_vertical + _pad(width - 2) + border_vertical
 
     def content_line(text: str) -> str:
         visible_width: int = measure_width(text)
         right_padding: int = max(0, inner - visible_width)
-        left_border: str = apply_style("|", STYLE_DIM)
-        right_border: str = apply_style("|", STYLE_DIM)
-        return left_border + " " + text + (" " * right_padding) + " " + right_border
+        return border_vertical + " " + text + _pad(right_padding) + " " + border_vertical
 
-    # --- assembly ---
-    lines: list[str] = []
-    lines.append(border_horizontal)
-    lines.append(empty_row)
-    lines.append(content_line(header_line))
-    lines.append(empty_row)
-    for body_line in body_lines:
-        lines.append(content_line(body_line))
-    lines.append(empty_row)
-    if footer_lines:
-        lines.append(content_line(apply_style("-" * inner, STYLE_DIM)))
-        for footer_line in footer_lines:
-            lines.append(content_line(footer_line))
-        lines.append(empty_row)
-    lines.append(border_horizontal)
+    # Body with no escape codes: visible width is len(), so rows pad via the
+    # format spec instead of measure_width's regex. Header and footer rows
+    # carry styling and always take the measured path.
+    if inner > 0 and "\033" not in body:
 
-    return "\n".join(lines)
+        def body_line(text: str) -> str:
+            return f"{border_vertical} {text:<{inner}} {border_vertical}"
+
+    else:
+        body_line = content_line
+
+    # --- footer rows ---
+    footer_rows: tuple[str, ...] = ()
+    if footer is not None:
+        wrapped_footer: str = wrap_text(footer, indent=0, width=inner)
+        footer_rows = (
+            content_line(apply_style("-" * inner, STYLE_DIM)),
+            *(content_line(apply_style(line, STYLE_DIM)) for line in wrapped_footer.split("\n")),
+            empty_row,
+        )
+
+    # --- assembly: one join over fixed pieces, body rows pulled lazily ---
+    return "\n".join(
+        itertools.chain(
+            (border_horizontal, empty_row, content_line(header_line), empty_row),
+            map(body_line, _iter_body_lines(body, inner)),
+            (empty_row,),
+            footer_rows,
+            (border_horizontal,),
+        )
+    )
+
+
+def _iter_body_lines(body: str, inner: int) -> Iterator[str]:
+    """Yield format_card body lines: each paragraph wrapped to inner width.
+
+    Equivalent to wrap_text(body, width=inner).split("\\n"), but pulls lines
+    straight from the per-paragraph wrapper without building and re-splitting
+    intermediate strings.
+    """
+    wrap_width: int = inner if inner > 0 else 1
+    for paragraph in body.split("\n"):
+        if paragraph.strip() == "":
+            yield ""
+        else:
+            yield from _wrap_paragraph(paragraph, wrap_width, 0)
 
 
 def format_choices(choices: list[tuple[str, str]], layout: str = "horizontal") -> str:
@@ -593,16 +744,16 @@ def format_choices(choices: list[tuple[str, str]], layout: str = "horizontal") -
 
 def _format_choices_horizontal(choices: list[tuple[str, str]]) -> str:
     """Horizontal layout with auto-fallback to vertical if too wide."""
+    # Keys and labels are plain text and only the key is styled, so each
+    # entry's visible width is known arithmetically -- no measure_width pass.
     entries: list[str] = []
+    visible_widths: list[int] = []
     for key, label in choices:
         styled_key: str = apply_style(key, STYLE_BOLD)
         entries.append(styled_key + " = " + label)
+        visible_widths.append(len(key) + 3 + len(label))
 
-    maximum_entry_width: int = 0
-    for entry in entries:
-        entry_visible_width: int = measure_width(entry)
-        if entry_visible_width > maximum_entry_width:
-            maximum_entry_width = entry_visible_width
+    maximum_entry_width: int = max(visible_widths, default=0)
     column_width: int = maximum_entry_width + 4
 
     total_width: int = column_width * len(entries)
@@ -610,10 +761,9 @@ def _format_choices_horizontal(choices: list[tuple[str, str]]) -> str:
         return _format_choices_vertical(choices)
 
     result_parts: list[str] = []
-    for entry in entries:
-        visible_width: int = measure_width(entry)
+    for entry, visible_width in zip(entries, visible_widths):
         padding: int = column_width - visible_width
-        result_parts.append(entry + " " * padding)
+        result_parts.append(entry + _pad(padding))
 
     return "".join(result_parts).rstrip()
 
@@ -633,12 +783,46 @@ def _format_choices_vertical(choices: list[tuple[str, str]]) -> str:
     return "\n".join(lines)
 
 
+def _format_weeks(day_count: int) -> str:
+    return str(round(day_count / 7)) + " weeks"
+
+
+def _format_months(day_count: int) -> str:
+    month_count: int = round(day_count / 30)
+    if month_count == 1:
+        return "1 month"
+    return str(month_count) + " months"
+
+
+def _format_years(day_count: int) -> str:
+    year_count: int = round(day_count / 365)
+    if year_count == 1:
+        return "1 year"
+    return str(year_count) + " years"
+
+
+# format_duration buckets: bisect_right(_DURATION_THRESHOLDS, day_count)
+# indexes _DURATION_FORMATS. Entries are fixed strings or day_count -> str.
+_DURATION_THRESHOLDS: tuple[int, ...] = (0, 1, 2, 7, 14, 30, 60, 365)
+_DURATION_FORMATS: tuple[str | Callable[[int], str], ...] = (
+    "overdue",  # < 0
+    "today",  # 0
+    "tomorrow",  # 1
+    lambda day_count: str(day_count) + " days",  # 2-6
+    "1 week",  # 7-13
+    _format_weeks,  # 14-29
+    "1 month",  # 30-59
+    _format_months,  # 60-364
+    _format_years,  # >= 365
+)
+
+
 def format_duration(days: float) -> str:
     """Convert a numeric day count to a human-readable relative duration.
 
-    Threshold evaluation is top-to-bottom, first match wins. Input is
-    float because scheduling algorithms produce float intervals; round()
-    is applied immediately before threshold checks.
+    Thresholds are looked up by binary search over _DURATION_THRESHOLDS.
+    Input is float because scheduling algorithms produce float intervals;
+    round() is applied immediately before the lookup.
 
     Returns plain string with no styling. Caller applies styling as needed.
 
@@ -650,42 +834,105 @@ def format_duration(days: float) -> str:
         "1 week", "3 months", "2 years", etc.
     """
     day_count: int = round(days)
-    if day_count < 0:
-        return "overdue"
-    if day_count == 0:
-        return "today"
-    if day_count == 1:
-        return "tomorrow"
-    if day_count < 7:
-        return str(day_count) + " days"
-    if day_count < 14:
-        return "1 week"
-    if day_count < 30:
-        week_count: int = round(day_count / 7)
-        return str(week_count) + " weeks"
-    if day_count < 60:
-        return "1 month"
-    if day_count < 365:
-        month_count: int = round(day_count / 30)
-        if month_count == 1:
-            return "1 month"
-        return str(month_count) + " months"
-    year_count: int = round(day_count / 365)
-    if year_count == 1:
-        return "1 year"
-    return str(year_count) + " years"
+    duration_format = _DURATION_FORMATS[bisect.bisect_right(_DURATION_THRESHOLDS, day_count)]
+    if isinstance(duration_format, str):
+        return duration_format
+    return duration_format(day_count)
+
 
+@functools.lru_cache(maxsize=32)
+def _get_wrapper(width: int, indent: int) -> textwrap.TextWrapper:
+    """Return a shared TextWrapper for (width, indent).
 
-def wrap_text(text: str, indent: int = 0, width: int | None = None) -> str:
+    Same settings textwrap.fill() would build per call; cached so repeated
+    paragraphs reuse one wrapper instead of constructing a new one each time.
+    """
+    indent_text: str = _pad(indent)
+    return textwrap.TextWrapper(
+        width=width,
+        initial_indent=indent_text,
+        subsequent_indent=indent_text,
+    )
+
+
+def _fast_wrap(paragraph: str, width: int, indent: int) -> list[str] | None:
+    """First-fit word wrap for plain, single-spaced text.
+
+    Greedily packs space-separated words into lines of at most width
+    columns (indent included), slicing each line straight out of the
+    paragraph rather than splitting into words and rejoining. Returns None
+    when the paragraph needs TextWrapper's general handling instead: tabs
+    or control whitespace, runs of spaces, leading/trailing spaces, or a
+    word too long for one line. Unlike TextWrapper, never breaks after a
+    hyphen.
+    """
+    available: int = width - indent
+    if (
+        available <= 0
+        or "  " in paragraph
+        or paragraph[0] == " "
+        or paragraph[-1] == " "
+        or not paragraph.isprintable()
+    ):
+        return None
+    indent_text: str = _pad(indent)
+    lines: list[str] = []
+    start: int = 0
+    # Forward scan: each line is a slice ending at the last space that fits.
+    while len(paragraph) - start > available:
+        break_at: int = paragraph.rfind(" ", start, start + available + 1)
+        if break_at < 0:
+            return None  # word longer than a line; TextWrapper breaks it
+        lines.append(indent_text + paragraph[start:break_at])
+        start = break_at + 1
+    lines.append(indent_text + paragraph[start:])
+    return lines
+
+
+def _fits_unchanged(paragraph: str, width: int, indent: int) -> bool:
+    """True if wrapping would return the non-empty paragraph as-is.
+
+    It must fit the width with its indent, and contain nothing TextWrapper
+    would rewrite: no tabs or other control whitespace, no trailing space.
+    """
+    return (
+        indent + len(paragraph) <= width
+        and paragraph[-1] != " "
+        and paragraph.isprintable()
+    )
+
+
+def _wrap_paragraph(paragraph: str, width: int, indent: int, strict: bool = False) -> list[str]:
+    """Wrap one non-blank paragraph into lines, indent included.
+
+    Short paragraphs that already fit (_fits_unchanged) skip wrapping
+    entirely. Otherwise _fast_wrap is tried first unless strict is set,
+    with TextWrapper as the fallback.
+    """
+    if _fits_unchanged(paragraph, width, indent):
+        return [_pad(indent) + paragraph]
+    if not strict:
+        fast_lines: list[str] | None = _fast_wrap(paragraph, width, indent)
+        if fast_lines is not None:
+            return fast_lines
+    return _get_wrapper(width, indent).wrap(paragraph)
+
+
+def wrap_text(text: str, indent: int = 0, width: int | None = None, strict: bool = False) -> str:
     """Wrap text to specified width with optional indentation.
 
     Preserves existing paragraph breaks (double newlines).
     Each paragraph is wrapped independently and rejoined.
 
+    Plain single-spaced paragraphs use a first-fit word wrapper that never
+    breaks after hyphens; anything else goes through textwrap. strict=True
+    always uses textwrap (textwrap.fill semantics, hyphen breaks included).
+
     Args:
         text: Text to wrap (may contain newlines)
         indent: Number of spaces to indent wrapped lines (default: 0)
         width: Maximum line width (default: terminal width)
+        strict: Always wrap with textwrap (default: False)
 
     Returns:
         Wrapped text as single string with newlines
@@ -700,18 +947,20 @@ def wrap_text(text: str, indent: int = 0, width: int | None = None) -> str:
     if effective_width <= 0:
         effective_width = 1
     paragraphs = text.split("\n")
-    wrapped_paragraphs = []
-    for paragraph in paragraphs:
-        if paragraph.strip() == "":
-            wrapped_paragraphs.append("")
-        else:
-            wrapped = textwrap.fill(
-                paragraph,
-                width=effective_width,
-                initial_indent=" " * indent,
-                subsequent_indent=" " * indent,
-            )
-            wrapped_paragraphs.append(wrapped)
+    # Unindented text whose lines all fit as-is (or are empty) comes back
+    # unchanged, without building any per-paragraph strings.
+    if indent == 0 and all(
+        not paragraph or _fits_unchanged(paragraph, effective_width, 0)
+        for paragraph in paragraphs
+    ):
+        return text
+    # One output slot per paragraph, built in a single comprehension pass.
+    wrapped_paragraphs = [
+        "\n".join(_wrap_paragraph(paragraph, effective_width, indent, strict))
+        if paragraph.strip()
+        else ""
+        for paragraph in paragraphs
+    ]
     return "\n".join(wrapped_paragraphs)
 
 
@@ -728,8 +977,10 @@ def clear_screen() -> None:
 
     Writes to stderr, consistent with module convention (stdout is data).
     Always executes regardless of verbosity -- screen clearing is a visual
-    operation, not a diagnostic message.
+    operation, not a diagnostic message. Buffered messages are flushed
+    first so they land before the clear.
     """
+    flush_messages()
     if STDERR_IS_TERMINAL:
         sys.stderr.write("\033[2J\033[H")
         sys.stderr.flush()
@@ -754,8 +1005,32 @@ def emit(text: str) -> None:
     Args:
         text: String to emit, may be multi-line, may contain ANSI codes.
     """
-    aligned: str = align_text(text, align=_get_align(), width=get_terminal_width())
-    print(aligned)
+    if _layout_align == "left":
+        # Left alignment is a no-op: skip align_text, one write.
+        sys.stdout.write(text + "\n")
+        return
+    aligned: str = align_text(text, align=_layout_align, width=get_terminal_width())
+    sys.stdout.write(aligned + "\n")
+
+
+def emit_many(texts: Iterable[str]) -> None:
+    """Write several layout-aware blocks to stdout in a single write.
+
+    Same result as calling emit() on each text in order, but the aligned
+    blocks are joined and written once -- for callers printing a run of
+    cards or list rows. Mixing emit_many() and emit() keeps ordering;
+    both go through sys.stdout.
+
+    Args:
+        texts: Strings to emit, each may be multi-line and contain ANSI codes.
+    """
+    if _layout_align == "left":
+        blocks: list[str] = list(texts)
+    else:
+        terminal_width: int = get_terminal_width()
+        blocks = [align_text(text, align=_layout_align, width=terminal_width) for text in texts]
+    if blocks:
+        sys.stdout.write("\n".join(blocks) + "\n")
 
 
 # ============================================================================
@@ -763,63 +1038,124 @@ def emit(text: str) -> None:
 # ============================================================================
 
 
-def _write_message(level: str, priority: int, style_code: str, message: str) -> None:
+def flush_messages() -> None:
+    """Write any buffered msg_*() lines to stderr in a single write."""
+    if _message_buffer:
+        sys.stderr.write("".join(_message_buffer))
+        _message_buffer.clear()
+        sys.stderr.flush()
+
+
+atexit.register(flush_messages)
+
+
+def _write_stderr_line(line: str, urgent: bool = False) -> None:
+    """Send one finished message line to stderr, or to the batch buffer.
+
+    urgent lines (errors, warnings) drain the buffer immediately, so they
+    are never held back behind batched info/debug output.
+    """
+    if not _buffer_messages:
+        sys.stderr.write(line)
+        return
+    _message_buffer.append(line)
+    if urgent or len(_message_buffer) >= _MESSAGE_BUFFER_LIMIT:
+        flush_messages()
+
+
+# "(caller) " prefixes by caller name. Trace output repeats a small set of
+# call sites, so each prefix string is built once per process.
+_trace_prefixes: dict[str, str] = {}
+
+# "[LEVEL] " labels with the level already padded to five columns. Each msg_*
+# passes its own constant, so no per-message lookup or formatting remains.
+_LABEL_ERROR: str = "[ERROR] "
+_LABEL_WARN: str = "[WARN ] "
+_LABEL_INFO: str = "[INFO ] "
+_LABEL_DEBUG: str = "[DEBUG] "
+_LABEL_OK: str = "[OK   ] "
+
+
+def _write_message(
+    level_label: str, priority: int, style_code: str, message: str, caller: str | None = None
+) -> None:
     """Write a styled, leveled message to stderr.
 
-    This is the core messaging primitive. All public msg_* functions call this.
+    This is the core messaging primitive. All public msg_* functions call
+    this, and gate on VERBOSITY themselves first, so a suppressed message
+    costs one comparison and never reaches here.
 
     Logic:
-        1. Suppress if current VERBOSITY < priority
-        2. Warn and return if message is empty
-        3. At VERBOSITY >= 5, prepend caller function name (trace)
-        4. Format: [LEVEL] {trace}{message}
-        5. Write to stderr
+        1. Warn and return if message is empty
+        2. At VERBOSITY >= 5, prepend caller function name (trace); the
+           frame is only inspected when the caller did not supply its name
+        3. Format: [LEVEL] {trace}{message}
+        4. Write to stderr in one write (align_text skipped for "left"),
+           or queue it when message buffering is on
 
     Args:
-        level: Display label ("ERROR", "WARN", "INFO", "DEBUG", "OK")
-        priority: Numeric threshold (1=error, 2=warn, 3=info, 4=debug)
+        level_label: Prebuilt "[LEVEL] " tag, one of the _LABEL_* constants
+        priority: Numeric threshold (1=error, 2=warn, 3=info, 4=debug);
+                  errors and warnings flush buffered messages at once
         style_code: ANSI style constant for the entire line
         message: Text to display
+        caller: Name shown in the trace prefix. None looks it up from the
+                stack (two frames up: past the msg_* wrapper).
     """
-    if VERBOSITY < priority:
-        return
     if not message or message.isspace():
-        sys.stderr.write(
-            f"{STYLE_YELLOW}[WARN ] empty message passed to _write_message{STYLE_RESET}\n"
+        _write_stderr_line(
+            f"{STYLE_YELLOW}[WARN ] empty message passed to _write_message{STYLE_RESET}\n",
+            urgent=True,
         )
         return
     trace_prefix = ""
     if VERBOSITY >= 5:
-        caller_name = sys._getframe(2).f_code.co_name
-        trace_prefix = f"({caller_name}) "
-    formatted_line: str = f"{style_code}[{level:<5}] {trace_prefix}{message}{STYLE_RESET}"
-    aligned_line: str = align_text(formatted_line, align=_get_align(), width=get_terminal_width())
-    sys.stderr.write(aligned_line + "\n")
+        caller_name = caller if caller is not None else sys._getframe(2).f_code.co_name
+        trace_prefix = _trace_prefixes.get(caller_name)
+        if trace_prefix is None:
+            trace_prefix = _trace_prefixes[caller_name] = f"({caller_name}) "
+    urgent: bool = priority <= 2
+    if _layout_align == "left":
+        # Common case: no alignment, so build the final line once and write it.
+        _write_stderr_line(f"{style_code}{level_label}{trace_prefix}{message}{_LINE_END}", urgent)
+        return
+    formatted_line: str = f"{style_code}{level_label}{trace_prefix}{message}{STYLE_RESET}"
+    aligned_line: str = align_text(formatted_line, align=_layout_align, width=get_terminal_width())
+    _write_stderr_line(aligned_line + "\n", urgent)
 
 
-def msg_error(message: str) -> None:
-    """Write an error message to stderr. Shown at verbosity >= 1."""
-    _write_message("ERROR", 1, STYLE_RED, message)
+def msg_error(message: str, caller: str | None = None) -> None:
+    """Write an error message to stderr. Shown at verbosity >= 1.
+
+    All msg_* functions accept caller= to name the trace prefix shown at
+    verbosity 5 directly, skipping the stack-frame lookup.
+    """
+    if VERBOSITY >= 1:
+        _write_message(_LABEL_ERROR, 1, STYLE_RED, message, caller)
 
 
-def msg_warn(message: str) -> None:
+def msg_warn(message: str, caller: str | None = None) -> None:
     """Write a warning message to stderr. Shown at verbosity >= 2."""
-    _write_message("WARN", 2, STYLE_YELLOW, message)
+    if VERBOSITY >= 2:
+        _write_message(_LABEL_WARN, 2, STYLE_YELLOW, message, caller)
 
 
-def msg_info(message: str) -> None:
+def msg_info(message: str, caller: str | None = None) -> None:
     """Write an info message to stderr. Shown at verbosity >= 3."""
-    _write_message("INFO", 3, STYLE_CYAN, message)
+    if VERBOSITY >= 3:
+        _write_message(_LABEL_INFO, 3, STYLE_CYAN, message, caller)
 
 
-def msg_debug(message: str) -> None:
+def msg_debug(message: str, caller: str | None = None) -> None:
     """Write a debug message to stderr. Shown at verbosity >= 4."""
-    _write_message("DEBUG", 4, STYLE_GRAY, message)
+    if VERBOSITY >= 4:
+        _write_message(_LABEL_DEBUG, 4, STYLE_GRAY, message, caller)
 
 
-def msg_success(message: str) -> None:
+def msg_success(message: str, caller: str | None = None) -> None:
     """Write a success message to stderr. Shown at verbosity >= 3.
 
     Same priority as info - informational, just styled differently.
     """
-    _write_message("OK", 3, STYLE_GREEN, message)
+    if VERBOSITY >= 3:
+        _write_message(_LABEL_OK, 3, STYLE_GREEN, message, caller)
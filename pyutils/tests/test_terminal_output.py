@@ -10,6 +10,12 @@ Run: uv run test_terminal_output.py
  or: python -m pytest test_terminal_output.py -q
 """
 
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+
 import pytest
 
 from pyutils import terminal_output as to
@@ -23,6 +29,14 @@ def color_off():
     to.set_color(False)
 
 
+@pytest.fixture(autouse=True)
+def messages_unbuffered():
+    """Write msg_* output immediately so capsys sees it; buffering tests opt in."""
+    to.set_message_buffering(False)
+    yield
+    to.set_message_buffering(False)
+
+
 # =============================================================================
 # COLOR STATE (the set_color injection point)
 # =============================================================================
@@ -48,6 +62,11 @@ def test_apply_style_respects_current_state():
     assert to.apply_style("x", to.STYLE_RED) == "x"
 
 
+def test_apply_style_is_noop_when_disabled_even_with_raw_code():
+    to.set_color(False)
+    assert to.apply_style("x", "\033[31m") == "x"
+
+
 # =============================================================================
 # PRIMITIVES
 # =============================================================================
@@ -60,6 +79,25 @@ def test_measure_width_strips_ansi_and_takes_longest_line():
     assert to.measure_width("\033[31m\033[0m") == 0
 
 
+def test_terminal_width_redetected_after_resize_invalidation(monkeypatch):
+    monkeypatch.setattr(to, "_cached_terminal_width", 33)
+    monkeypatch.setattr(os, "get_terminal_size", lambda: os.terminal_size((120, 40)))
+    assert to.get_terminal_width() == 33
+    to._invalidate_terminal_width(0, None)
+    assert to.get_terminal_width() == 120
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGWINCH"), reason="POSIX only")
+def test_resize_tracking_is_opt_in():
+    previous = signal.getsignal(signal.SIGWINCH)
+    assert previous is not to._invalidate_terminal_width
+    try:
+        assert to.enable_resize_tracking() is True
+        assert signal.getsignal(signal.SIGWINCH) is to._invalidate_terminal_width
+    finally:
+        signal.signal(signal.SIGWINCH, previous)
+
+
 def test_align_text_center_and_right_block_alignment():
     assert to.align_text("ab\ncdef", "center", 8) == "  ab\n  cdef"
     assert to.align_text("ab\ncdef", "right", 8) == "    ab\n    cdef"
@@ -67,6 +105,11 @@ def test_align_text_center_and_right_block_alignment():
     assert to.align_text("abcdefgh", "center", 8) == "abcdefgh"  # fills width
 
 
+def test_align_text_pads_styled_text_by_visible_width():
+    styled = "\033[1;33m" + "abcd" + "\033[0m"  # raw length 15, visible 4
+    assert to.align_text(styled, "right", 8) == "    " + styled
+
+
 def test_align_text_never_right_pads():
     for line in to.align_text("ab\ncdef", "center", 20).split("\n"):
         assert line == line.rstrip()
@@ -101,12 +144,49 @@ def test_format_label():
     assert to.format_label("model", "sonnet") == "[model: sonnet]"
 
 
+def test_format_label_flag_cache_follows_color_state():
+    assert to.format_label_flag("dry-run") == "[dry-run]"
+    to.set_color(True)
+    assert to.format_label_flag("dry-run") == "\033[36m[dry-run]\033[0m"
+    assert to.format_label_kv("model", "x") == "\033[36m[model: x]\033[0m"
+
+
+def test_format_highlight_cache_follows_color_state():
+    to.set_color(True)
+    assert to.format_highlight("term") == "\033[1;33mterm\033[0m"
+    to.set_color(False)
+    assert to.format_highlight("term") == "term"
+
+
+def test_format_separator_cache_follows_color_state():
+    assert to.format_separator("=", 4) == "===="
+    to.set_color(True)
+    assert to.format_separator("=", 4) == "\033[2m====\033[0m"
+
+
+def test_format_block_borders_match_header_length():
+    assert to.format_block("API", "body") == "--- API ---\nbody\n-----------"
+    to.set_color(True)
+    assert to.format_block("API", "body") == (
+        "\033[2m--- API ---\033[0m\nbody\n\033[2m-----------\033[0m"
+    )
+
+
 def test_format_cost_precision_scales():
     assert to.format_cost(0.0032) == "$0.0032"
     assert to.format_cost(0.125) == "$0.125"
     assert to.format_cost(3.456) == "$3.46"
 
 
+@pytest.mark.parametrize(
+    "cost, expected",
+    [(0.0099999, "$0.0100"), (0.01, "$0.010"), (0.9999, "$1.000"), (1.0, "$1.00")],
+)
+def test_format_cost_precision_boundaries(cost, expected):
+    """Precision switches on the unrounded value; the digits then round."""
+    assert to.format_cost(cost) == expected
+
+
 def test_format_card_lines_all_same_visible_width_with_color_on():
     """The border-flush guarantee must hold WITH ANSI codes present."""
     to.set_color(True)
@@ -121,12 +201,149 @@ def test_format_choices_horizontal_falls_back_to_vertical_when_wide():
     assert "\n" in out  # fell back to vertical
 
 
+def test_format_choices_horizontal_pads_by_visible_width_with_color_on():
+    to.set_color(True)
+    out = to.format_choices([("0", "failed"), ("1", "passed")])
+    assert to.measure_width(out) == 2 * (len("0 = failed") + 4) - 4
+
+
 def test_wrap_text_preserves_blank_lines_and_indents():
     out = to.wrap_text("one two three four\n\nfive", indent=2, width=12)
     lines = out.split("\n")
     assert lines[0].startswith("  ") and "" in lines
 
 
+@pytest.mark.parametrize(
+    "paragraph",
+    [
+        "short",
+        "  leading kept",
+        "trailing dropped  ",
+        "tab\tinside",
+        "one two three four five six",
+    ],
+)
+def test_wrap_text_matches_textwrap_fill(paragraph):
+    expected = textwrap.fill(
+        paragraph, width=10, initial_indent="  ", subsequent_indent="  "
+    )
+    assert to.wrap_text(paragraph, indent=2, width=12) == expected
+
+
+def test_wrap_text_fast_mode_keeps_hyphenated_words_whole():
+    assert to.wrap_text("see well-known", width=10) == "see\nwell-known"
+    assert to.wrap_text("see well-known", width=10, strict=True) == "see well-\nknown"
+
+
+# =============================================================================
+# OUTPUT
+# =============================================================================
+
+
+def test_emit_left_writes_text_unchanged(capsys):
+    to.emit("ab\ncd")
+    assert capsys.readouterr().out == "ab\ncd\n"
+
+
+def test_emit_centers_within_terminal_width(capsys, monkeypatch):
+    monkeypatch.setattr(to, "_cached_terminal_width", 10)
+    monkeypatch.setattr(to, "_layout_align", "center")
+    to.emit("ab")
+    assert capsys.readouterr().out == "    ab\n"
+
+
+def test_emit_many_matches_repeated_emit(capsys, monkeypatch):
+    monkeypatch.setattr(to, "_cached_terminal_width", 10)
+    monkeypatch.setattr(to, "_layout_align", "right")
+    for text in ("ab", "c\nde"):
+        to.emit(text)
+    expected = capsys.readouterr().out
+    to.emit_many(["ab", "c\nde"])
+    assert capsys.readouterr().out == expected
+    to.emit_many([])
+    assert capsys.readouterr().out == ""
+
+
+# =============================================================================
+# MESSAGES
+# =============================================================================
+
+
+def test_msg_info_writes_single_line_to_stderr(capsys):
+    to.msg_info("hello")
+    assert capsys.readouterr().err == "[INFO ] hello\n"
+
+
+def test_msg_line_styled_and_reset_with_color_on(capsys):
+    to.set_color(True)
+    to.msg_error("bad")
+    assert capsys.readouterr().err == "\033[31m[ERROR] bad\033[0m\n"
+
+
+@pytest.mark.parametrize("message", ["", " ", " " * 200])
+def test_msg_empty_or_whitespace_only_warns_instead(capsys, message):
+    to.msg_info(message)
+    assert capsys.readouterr().err == "[WARN ] empty message passed to _write_message\n"
+
+
+def test_msg_suppressed_below_verbosity(capsys):
+    to.set_verbosity(1)
+    try:
+        to.msg_info("hidden")
+    finally:
+        to.set_verbosity(3)
+    assert capsys.readouterr().err == ""
+
+
+def test_buffered_messages_written_together_on_flush(capsys):
+    to.set_message_buffering(True)
+    to.msg_info("one")
+    to.msg_success("two")
+    assert capsys.readouterr().err == ""
+    to.flush_messages()
+    assert capsys.readouterr().err == "[INFO ] one\n[OK   ] two\n"
+
+
+def test_buffered_warning_drains_pending_messages(capsys):
+    to.set_message_buffering(True)
+    to.msg_info("queued")
+    to.msg_warn("urgent")
+    assert capsys.readouterr().err == "[INFO ] queued\n[WARN ] urgent\n"
+
+
+def test_messages_precede_traceback_when_stderr_is_piped():
+    """Unbuffered by default: a message is not held past an uncaught exception."""
+    script = (
+        "from pyutils import terminal_output as to\n"
+        "to.msg_info('before')\n"
+        "raise SystemError('boom')\n"
+    )
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(to.__file__)))
+    environment = dict(os.environ, PYTHONPATH=package_root)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=environment,
+        check=False,
+    )
+    assert result.returncode != 0
+    assert result.stderr.startswith("[INFO ] before\nTraceback")
+
+
+def test_msg_trace_prefix_uses_frame_or_explicit_caller(capsys):
+    to.set_verbosity(5)
+    try:
+        to.msg_info("traced")
+        to.msg_info("named", caller="loader")
+    finally:
+        to.set_verbosity(3)
+    assert capsys.readouterr().err.splitlines() == [
+        "[INFO ] (test_msg_trace_prefix_uses_frame_or_explicit_caller) traced",
+        "[INFO ] (loader) named",
+    ]
+
+
 if __name__ == "__main__":
     import sys
 
@@ -8,7 +8,8 @@ Everything else is just efficiency.
 import os  # os.path.exists
 import math  # math.log, math.exp
 import time  # time.perf_counter (instrumentation)
-import random  # random.seed, random.choices, random.gauss, random.shuffle
+import bisect  # bisect.bisect
+import random  # random.seed, random.random, random.gauss, random.shuffle
 
 random.seed(42)  # Let there be order among chaos
 
@@ -63,6 +64,21 @@ def tape_append_node(
     return node_index
 
 
+def tape_append_many(
+    data_list: list[float],
+    children_list: list[tuple[int, ...]],
+    local_grads_list: list[tuple[float, ...]],
+) -> list[int]:
+    # Record a batch of nodes with one extend per tape list
+    start_index: int = len(tape_data)
+    node_count: int = len(data_list)
+    tape_data.extend(data_list)
+    tape_grad.extend([0.0] * node_count)
+    tape_children.extend(children_list)
+    tape_local_grads.extend(local_grads_list)
+    return list(range(start_index, start_index + node_count))
+
+
 def tape_add(a_index: int, b_index: int) -> int:
     data: float = tape_data[a_index] + tape_data[b_index]
     return tape_append_node(data, (a_index, b_index), (1.0, 1.0))
@@ -75,24 +91,32 @@ def tape_multiply(a_index: int, b_index: int) -> int:
     return tape_append_node(data, (a_index, b_index), (b_data, a_data))
 
 
-def tape_power(a_index: int, exponent: float) -> int:
+def tape_scale(a_index: int, factor: float) -> int:
+    # Multiply by a plain float constant: no leaf node is recorded for it
     a_data: float = tape_data[a_index]
-    data: float = a_data**exponent
-    local_grad: float = exponent * (a_data ** (exponent - 1))
-    return tape_append_node(data, (a_index,), (local_grad,))
+    data: float = a_data * factor
+    return tape_append_node(data, (a_index,), (factor,))
 
 
-def tape_log(a_index: int) -> int:
+def tape_add_constant(a_index: int, constant: float) -> int:
     a_data: float = tape_data[a_index]
-    data: float = math.log(a_data)
-    local_grad: float = 1.0 / a_data
-    return tape_append_node(data, (a_index,), (local_grad,))
+    data: float = a_data + constant
+    return tape_append_node(data, (a_index,), (1.0,))
+
+
+def tape_square(a_index: int) -> int:
+    a_data: float = tape_data[a_index]
+    data: float = a_data * a_data
+    return tape_append_node(data, (a_index,), (2.0 * a_data,))
 
 
-def tape_exp(a_index: int) -> int:
+def tape_rsqrt(a_index: int) -> int:
+    # Reciprocal square root; its derivative reuses the result:
+    # d/da a**-0.5 = -0.5 * (a**-0.5) ** 3
     a_data: float = tape_data[a_index]
-    data: float = math.exp(a_data)
-    return tape_append_node(data, (a_index,), (data,))
+    data: float = a_data**-0.5
+    local_grad: float = -0.5 * data * data * data
+    return tape_append_node(data, (a_index,), (local_grad,))
 
 
 def tape_relu(a_index: int) -> int:
@@ -118,6 +142,7 @@ number_of_heads: int = 4  # number of attention heads
 number_of_layers: int = 1  # number of layers
 block_size: int = 8  # maximum sequence length
 head_dimension: int = embedding_dimension // number_of_heads  # dimension of each head
+attention_inverse_scale: float = (head_dimension**0.5) ** -1.0  # 1 / sqrt(head size)
 
 # Build flat parameter storage with offset table
 parameter_offset_table: dict[str, tuple[int, int, int]] = {}
@@ -141,14 +166,12 @@ allocate_matrix("wte", vocab_size, embedding_dimension)
 allocate_matrix("wpe", block_size, embedding_dimension)
 allocate_matrix("lm_head", vocab_size, embedding_dimension)
 for layer_index in range(number_of_layers):
+    # Query, key and value projections stacked as one (3 * d, d) matrix:
+    # one linear pass over hidden yields all three, sliced apart after.
     allocate_matrix(
-        f"layer{layer_index}.attn_wq", embedding_dimension, embedding_dimension
-    )
-    allocate_matrix(
-        f"layer{layer_index}.attn_wk", embedding_dimension, embedding_dimension
-    )
-    allocate_matrix(
-        f"layer{layer_index}.attn_wv", embedding_dimension, embedding_dimension
+        f"layer{layer_index}.attn_wqkv",
+        3 * embedding_dimension,
+        embedding_dimension,
     )
     allocate_matrix(
         f"layer{layer_index}.attn_wo", embedding_dimension, embedding_dimension, std=0
@@ -197,18 +220,38 @@ def get_weight_matrix_float(name: str) -> list[list[float]]:
     return matrix
 
 
+# Flat-index weight rows never change, so the tape path builds each matrix
+# once here rather than on every forward call.
+weight_matrix_tape_table: dict[str, list[list[int]]] = {}
+for parameter_name in parameter_offset_table:
+    weight_matrix_tape_table[parameter_name] = get_weight_matrix_tape(parameter_name)
+
+
 def linear_tape(x: list[int], w: list[list[int]]) -> list[int]:
-    result: list[int] = []
+    # One dot-product node per weight row, with the closed-form local
+    # gradients (each weight receives its input partner, each input its
+    # weight partner), gathered first and appended to the tape in a batch.
+    x_data: list[float] = []
+    for x_index in x:
+        x_data.append(tape_data[x_index])
+    data_list: list[float] = []
+    children_list: list[tuple[int, ...]] = []
+    local_grads_list: list[tuple[float, ...]] = []
     for weight_row in w:
-        accumulator: int | None = None
-        for weight_index, x_index in zip(weight_row, x):
-            product: int = tape_multiply(weight_index, x_index)
-            if accumulator is None:
-                accumulator = product
-            else:
-                accumulator = tape_add(accumulator, product)
-        result.append(accumulator)
-    return result
+        data: float = 0.0
+        children: list[int] = []
+        local_grads: list[float] = []
+        for weight_index, x_index, x_value in zip(weight_row, x, x_data):
+            weight_value: float = tape_data[weight_index]
+            data += weight_value * x_value
+            children.append(weight_index)
+            local_grads.append(x_value)
+            children.append(x_index)
+            local_grads.append(weight_value)
+        data_list.append(data)
+        children_list.append(tuple(children))
+        local_grads_list.append(tuple(local_grads))
+    return tape_append_many(data_list, children_list, local_grads_list)
 
 
 def linear_float(x: list[float], w: list[list[float]]) -> list[float]:
@@ -221,40 +264,14 @@ def linear_float(x: list[float], w: list[list[float]]) -> list[float]:
     return result
 
 
-def softmax_tape(logits: list[int]) -> list[int]:
-    max_val: float = max(tape_data[idx] for idx in logits)
-    shifted: list[int] = []
-    for logit_index in logits:
-        max_node: int = tape_append_node(max_val, (), ())
-        neg_one: int = tape_append_node(-1.0, (), ())
-        neg_max: int = tape_multiply(max_node, neg_one)
-        shifted_logit: int = tape_add(logit_index, neg_max)
-        shifted.append(shifted_logit)
-    exps: list[int] = []
-    for shifted_index in shifted:
-        exp_index: int = tape_exp(shifted_index)
-        exps.append(exp_index)
-    total: int = exps[0]
-    for exp_index in exps[1:]:
-        total = tape_add(total, exp_index)
-    inv_total: int = tape_power(total, -1.0)
-    result: list[int] = []
-    for exp_index in exps:
-        normalized: int = tape_multiply(exp_index, inv_total)
-        result.append(normalized)
-    return result
-
-
 def softmax_float(logits: list[float]) -> list[float]:
     max_val: float = max(logits)
-    shifted: list[float] = []
-    for logit_value in logits:
-        shifted.append(logit_value - max_val)
+    # Shift, exponentiate and accumulate in one pass; normalize in a second
     exps: list[float] = []
-    for shifted_value in shifted:
-        exps.append(math.exp(shifted_value))
     total: float = 0.0
-    for exp_value in exps:
+    for logit_value in logits:
+        exp_value: float = math.exp(logit_value - max_val)
+        exps.append(exp_value)
         total += exp_value
     result: list[float] = []
     for exp_value in exps:
@@ -262,20 +279,92 @@ def softmax_float(logits: list[float]) -> list[float]:
     return result
 
 
+def attention_head_tape(
+    query_head: list[int],
+    key_head: list[list[int]],
+    value_head: list[list[int]],
+) -> list[int]:
+    # Scaled dot-product attention for one head, recorded as one node per
+    # output dimension. Each node's local gradients are the closed-form
+    # derivatives through the softmax, in place of the logit, exp, sum,
+    # reciprocal and weighting nodes the step-by-step version records.
+    query_data: list[float] = []
+    for query_index in query_head:
+        query_data.append(tape_data[query_index])
+    attn_logits: list[float] = []
+    for key_row in key_head:
+        dot_product: float = 0.0
+        for query_value, key_index in zip(query_data, key_row):
+            dot_product += query_value * tape_data[key_index]
+        attn_logits.append(dot_product * attention_inverse_scale)
+    attn_weights: list[float] = softmax_float(attn_logits)
+    output_indices: list[int] = []
+    for dimension_index in range(head_dimension):
+        output_value: float = 0.0
+        for time_step in range(len(value_head)):
+            value_data: float = tape_data[value_head[time_step][dimension_index]]
+            output_value += attn_weights[time_step] * value_data
+        children: list[int] = []
+        local_grads: list[float] = []
+        query_grads: list[float] = [0.0] * head_dimension
+        for time_step in range(len(value_head)):
+            value_index: int = value_head[time_step][dimension_index]
+            weight: float = attn_weights[time_step]
+            children.append(value_index)
+            local_grads.append(weight)
+            # d output / d logit, then through the 1/sqrt(head size) scale
+            logit_grad: float = weight * (tape_data[value_index] - output_value)
+            scaled_grad: float = logit_grad * attention_inverse_scale
+            key_row: list[int] = key_head[time_step]
+            for query_position in range(head_dimension):
+                key_index: int = key_row[query_position]
+                children.append(key_index)
+                local_grads.append(scaled_grad * query_data[query_position])
+                query_grads[query_position] += scaled_grad * tape_data[key_index]
+        for query_position in range(head_dimension):
+            children.append(query_head[query_position])
+            local_grads.append(query_grads[query_position])
+        output_indices.append(
+            tape_append_node(output_value, tuple(children), tuple(local_grads))
+        )
+    return output_indices
+
+
+def softmax_cross_entropy_tape(logits: list[int], target_id: int) -> int:
+    # Loss -log(softmax(logits)[target_id]) as one node over the logits. Its
+    # local gradients are the closed form probability - one_hot(target_id),
+    # so no per-logit softmax nodes are recorded.
+    max_val: float = max(tape_data[idx] for idx in logits)
+    exps: list[float] = []
+    for logit_index in logits:
+        exps.append(math.exp(tape_data[logit_index] - max_val))
+    total: float = exps[0]
+    for exp_value in exps[1:]:
+        total += exp_value
+    inv_total: float = total**-1.0
+    local_grads: list[float] = []
+    for token_index, exp_value in enumerate(exps):
+        probability: float = exp_value * inv_total
+        if token_index == target_id:
+            local_grads.append(probability - 1.0)
+        else:
+            local_grads.append(probability)
+    data: float = -math.log(exps[target_id] * inv_total)
+    return tape_append_node(data, tuple(logits), tuple(local_grads))
+
+
 def rmsnorm_tape(x: list[int]) -> list[int]:
     squares: list[int] = []
     for x_index in x:
-        square: int = tape_power(x_index, 2.0)
+        square: int = tape_square(x_index)
         squares.append(square)
     sum_squares: int = squares[0]
     for square in squares[1:]:
         sum_squares = tape_add(sum_squares, square)
-    n_const: int = tape_append_node(float(len(x)), (), ())
-    inv_n: int = tape_power(n_const, -1.0)
-    ms: int = tape_multiply(sum_squares, inv_n)
-    epsilon: int = tape_append_node(1e-5, (), ())
-    ms_eps: int = tape_add(ms, epsilon)
-    scale: int = tape_power(ms_eps, -0.5)
+    inverse_length: float = float(len(x)) ** -1.0
+    ms: int = tape_scale(sum_squares, inverse_length)
+    ms_eps: int = tape_add_constant(ms, 1e-5)
+    scale: int = tape_rsqrt(ms_eps)
     result: list[int] = []
     for x_index in x:
         scaled: int = tape_multiply(x_index, scale)
@@ -298,21 +387,12 @@ def rmsnorm_float(x: list[float]) -> list[float]:
 def forward_training(
     token_id: int,
     position_index: int,
-    keys: list[list[list[int]]],
-    values: list[list[list[int]]],
+    keys: list[list[list[list[int]]]],
+    values: list[list[list[list[int]]]],
 ) -> list[int]:
-    wte_start: int
-    wte_rows: int
-    wte_cols: int
-    wte_start, wte_rows, wte_cols = parameter_offset_table["wte"]
-    tok_emb_start: int = wte_start + token_id * wte_cols
-    token_embedding: list[int] = list(range(tok_emb_start, tok_emb_start + wte_cols))
-    wpe_start: int
-    wpe_rows: int
-    wpe_cols: int
-    wpe_start, wpe_rows, wpe_cols = parameter_offset_table["wpe"]
-    pos_emb_start: int = wpe_start + position_index * wpe_cols
-    position_embedding: list[int] = list(range(pos_emb_start, pos_emb_start + wpe_cols))
+    # Embedding rows are prebuilt in the weight tables: no offset arithmetic
+    token_embedding: list[int] = weight_matrix_tape_table["wte"][token_id]
+    position_embedding: list[int] = weight_matrix_tape_table["wpe"][position_index]
     hidden: list[int] = []
     for tok_index, pos_index in zip(token_embedding, position_embedding):
         hidden.append(tape_add(tok_index, pos_index))
@@ -320,96 +400,56 @@ def forward_training(
     for layer_index in range(number_of_layers):
         residual: list[int] = hidden
         hidden = rmsnorm_tape(hidden)
-        query: list[int] = linear_tape(
-            hidden, get_weight_matrix_tape(f"layer{layer_index}.attn_wq")
-        )
-        key: list[int] = linear_tape(
-            hidden, get_weight_matrix_tape(f"layer{layer_index}.attn_wk")
-        )
-        value: list[int] = linear_tape(
-            hidden, get_weight_matrix_tape(f"layer{layer_index}.attn_wv")
+        query_key_value: list[int] = linear_tape(
+            hidden, weight_matrix_tape_table[f"layer{layer_index}.attn_wqkv"]
         )
-        keys[layer_index].append(key)
-        values[layer_index].append(value)
-        attention_output: list[int] = []
+        query: list[int] = query_key_value[:embedding_dimension]
+        key: list[int] = query_key_value[embedding_dimension : 2 * embedding_dimension]
+        value: list[int] = query_key_value[2 * embedding_dimension :]
+        # Heads write straight into their slot of the concatenated output
+        attention_output: list[int] = [0] * embedding_dimension
         for head_index in range(number_of_heads):
             head_start: int = head_index * head_dimension
             query_head: list[int] = query[head_start : head_start + head_dimension]
-            key_head: list[list[int]] = [
-                ki[head_start : head_start + head_dimension] for ki in keys[layer_index]
-            ]
-            value_head: list[list[int]] = [
-                vi[head_start : head_start + head_dimension]
-                for vi in values[layer_index]
-            ]
-            attn_logits: list[int] = []
-            for time_step in range(len(key_head)):
-                dot_product: int | None = None
-                for dimension_index in range(head_dimension):
-                    product: int = tape_multiply(
-                        query_head[dimension_index],
-                        key_head[time_step][dimension_index],
-                    )
-                    if dot_product is None:
-                        dot_product = product
-                    else:
-                        dot_product = tape_add(dot_product, product)
-                scale: int = tape_append_node(head_dimension**0.5, (), ())
-                inv_scale: int = tape_power(scale, -1.0)
-                scaled_logit: int = tape_multiply(dot_product, inv_scale)
-                attn_logits.append(scaled_logit)
-            attn_weights: list[int] = softmax_tape(attn_logits)
+            # The cache is kept per head, so each key and value is sliced once
+            key_head: list[list[int]] = keys[layer_index][head_index]
+            key_head.append(key[head_start : head_start + head_dimension])
+            value_head: list[list[int]] = values[layer_index][head_index]
+            value_head.append(value[head_start : head_start + head_dimension])
+            head_output: list[int] = attention_head_tape(
+                query_head, key_head, value_head
+            )
             for dimension_index in range(head_dimension):
-                head_out_j: int | None = None
-                for time_step in range(len(value_head)):
-                    product: int = tape_multiply(
-                        attn_weights[time_step], value_head[time_step][dimension_index]
-                    )
-                    if head_out_j is None:
-                        head_out_j = product
-                    else:
-                        head_out_j = tape_add(head_out_j, product)
-                attention_output.append(head_out_j)
+                attention_output[head_start + dimension_index] = head_output[
+                    dimension_index
+                ]
         hidden = linear_tape(
-            attention_output, get_weight_matrix_tape(f"layer{layer_index}.attn_wo")
+            attention_output, weight_matrix_tape_table[f"layer{layer_index}.attn_wo"]
         )
         hidden = [tape_add(a, b) for a, b in zip(hidden, residual)]
         residual = hidden
         hidden = rmsnorm_tape(hidden)
         hidden = linear_tape(
-            hidden, get_weight_matrix_tape(f"layer{layer_index}.mlp_fc1")
+            hidden, weight_matrix_tape_table[f"layer{layer_index}.mlp_fc1"]
         )
-        hidden = [tape_power(tape_relu(xi), 2.0) for xi in hidden]
+        hidden = [tape_square(tape_relu(xi)) for xi in hidden]
         hidden = linear_tape(
-            hidden, get_weight_matrix_tape(f"layer{layer_index}.mlp_fc2")
+            hidden, weight_matrix_tape_table[f"layer{layer_index}.mlp_fc2"]
         )
         hidden = [tape_add(a, b) for a, b in zip(hidden, residual)]
-    logits: list[int] = linear_tape(hidden, get_weight_matrix_tape("lm_head"))
+    logits: list[int] = linear_tape(hidden, weight_matrix_tape_table["lm_head"])
     return logits
 
 
 def forward_inference(
     token_id: int,
     position_index: int,
-    keys: list[list[list[float]]],
-    values: list[list[list[float]]],
+    keys: list[list[list[list[float]]]],
+    values: list[list[list[list[float]]]],
 ) -> list[float]:
-    wte_start: int
-    wte_rows: int
-    wte_cols: int
-    wte_start, wte_rows, wte_cols = parameter_offset_table["wte"]
-    tok_emb_start: int = wte_start + token_id * wte_cols
-    token_embedding: list[float] = []
-    for column_index in range(wte_cols):
-        token_embedding.append(parameter_data[tok_emb_start + column_index])
-    wpe_start: int
-    wpe_rows: int
-    wpe_cols: int
-    wpe_start, wpe_rows, wpe_cols = parameter_offset_table["wpe"]
-    pos_emb_start: int = wpe_start + position_index * wpe_cols
-    position_embedding: list[float] = []
-    for column_index in range(wpe_cols):
-        position_embedding.append(parameter_data[pos_emb_start + column_index])
+    # Embedding rows are prebuilt in the weight tables: no offset arithmetic
+    token_embedding: list[float] = weight_matrix_float_table["wte"][token_id]
+    position_embedding: list[float] = weight_matrix_float_table["wpe"][position_index]
     hidden: list[float] = []
     for tok_value, pos_value in zip(token_embedding, position_embedding):
         hidden.append(tok_value + pos_value)
@@ -417,28 +457,24 @@ def forward_inference(
     for layer_index in range(number_of_layers):
         residual: list[float] = hidden
         hidden = rmsnorm_float(hidden)
-        query: list[float] = linear_float(
-            hidden, get_weight_matrix_float(f"layer{layer_index}.attn_wq")
-        )
-        key: list[float] = linear_float(
-            hidden, get_weight_matrix_float(f"layer{layer_index}.attn_wk")
+        query_key_value: list[float] = linear_float(
+            hidden, weight_matrix_float_table[f"layer{layer_index}.attn_wqkv"]
         )
-        value: list[float] = linear_float(
-            hidden, get_weight_matrix_float(f"layer{layer_index}.attn_wv")
-        )
-        keys[layer_index].append(key)
-        values[layer_index].append(value)
-        attention_output: list[float] = []
+        query: list[float] = query_key_value[:embedding_dimension]
+        key: list[float] = query_key_value[
+            embedding_dimension : 2 * embedding_dimension
+        ]
+        value: list[float] = query_key_value[2 * embedding_dimension :]
+        # Heads write straight into their slot of the concatenated output
+        attention_output: list[float] = [0.0] * embedding_dimension
         for head_index in range(number_of_heads):
             head_start: int = head_index * head_dimension
             query_head: list[float] = query[head_start : head_start + head_dimension]
-            key_head: list[list[float]] = [
-                ki[head_start : head_start + head_dimension] for ki in keys[layer_index]
-            ]
-            value_head: list[list[float]] = [
-                vi[head_start : head_start + head_dimension]
-                for vi in values[layer_index]
-            ]
+            # The cache is kept per head, so each key and value is sliced once
+            key_head: list[list[float]] = keys[layer_index][head_index]
+            key_head.append(key[head_start : head_start + head_dimension])
+            value_head: list[list[float]] = values[layer_index][head_index]
+            value_head.append(value[head_start : head_start + head_dimension])
             attn_logits: list[float] = []
             for time_step in range(len(key_head)):
                 dot_product: float = 0.0
@@ -456,22 +492,22 @@ def forward_inference(
                     head_out_j += (
                         attn_weights[time_step] * value_head[time_step][dimension_index]
                     )
-                attention_output.append(head_out_j)
+                attention_output[head_start + dimension_index] = head_out_j
         hidden = linear_float(
-            attention_output, get_weight_matrix_float(f"layer{layer_index}.attn_wo")
+            attention_output, weight_matrix_float_table[f"layer{layer_index}.attn_wo"]
         )
         hidden = [a + b for a, b in zip(hidden, residual)]
         residual = hidden
         hidden = rmsnorm_float(hidden)
         hidden = linear_float(
-            hidden, get_weight_matrix_float(f"layer{layer_index}.mlp_fc1")
+            hidden, weight_matrix_float_table[f"layer{layer_index}.mlp_fc1"]
         )
         hidden = [max(0.0, xi) ** 2.0 for xi in hidden]
         hidden = linear_float(
-            hidden, get_weight_matrix_float(f"layer{layer_index}.mlp_fc2")
+            hidden, weight_matrix_float_table[f"layer{layer_index}.mlp_fc2"]
         )
         hidden = [a + b for a, b in zip(hidden, residual)]
-    logits: list[float] = linear_float(hidden, get_weight_matrix_float("lm_head"))
+    logits: list[float] = linear_float(hidden, weight_matrix_float_table["lm_head"])
     return logits
 
 
@@ -483,22 +519,43 @@ epsilon_adam: float
 learning_rate, beta1, beta2, epsilon_adam = 1e-2, 0.9, 0.95, 1e-8
 first_moment: list[float] = [0.0] * len(parameter_data)  # first moment buffer
 second_moment: list[float] = [0.0] * len(parameter_data)  # second moment buffer
+one_minus_beta1: float = 1 - beta1
+one_minus_beta2: float = 1 - beta2
 
 # Repeat in sequence
 num_steps: int = 500  # number of training steps
+
+# Tape buffers persist across steps. Parameter leaves hold the first
+# parameter_count slots; each step truncates the tape back to them and
+# refreshes their data and gradients in place.
+parameter_count: int = len(parameter_data)
+zero_gradients: list[float] = [0.0] * parameter_count
+tape_children.extend([()] * parameter_count)
+tape_local_grads.extend([()] * parameter_count)
+
+# Tokenize every document once, surrounded by BOS on both sides, so the
+# training loop only indexes into ready-made token lists.
+tokenized_docs: list[list[int]] = []
+for doc in docs:
+    doc_tokens: list[int] = [BOS]
+    for character in doc:
+        doc_tokens.append(character_to_token[character])
+    doc_tokens.append(BOS)
+    tokenized_docs.append(doc_tokens)
+
 for step in range(num_steps):
-    tape_data = parameter_data.copy()
-    tape_grad = [0.0] * len(parameter_data)
-    tape_children = [() for _ in range(len(parameter_data))]
-    tape_local_grads = [() for _ in range(len(parameter_data))]
-
-    doc: str = docs[step % len(docs)]
-    tokens: list[int] = (
-        [BOS] + [character_to_token[character] for character in doc] + [BOS]
-    )
+    tape_data[:] = parameter_data
+    tape_grad[:] = zero_gradients
+    del tape_children[parameter_count:]
+    del tape_local_grads[parameter_count:]
+
+    tokens: list[int] = tokenized_docs[step % len(tokenized_docs)]
     sequence_length: int = min(block_size, len(tokens) - 1)
-    keys: list[list[list[int]]] = [[] for _ in range(number_of_layers)]
-    values: list[list[list[int]]] = [[] for _ in range(number_of_layers)]
+    keys: list[list[list[list[int]]]] = []
+    values: list[list[list[list[int]]]] = []
+    for _ in range(number_of_layers):
+        keys.append([[] for _ in range(number_of_heads)])
+        values.append([[] for _ in range(number_of_heads)])
     losses: list[int] = []
 
     if INSTRUMENT:
@@ -509,9 +566,7 @@ for step in range(num_steps):
         target_id: int
         token_id, target_id = tokens[position_index], tokens[position_index + 1]
         logits: list[int] = forward_training(token_id, position_index, keys, values)
-        probs: list[int] = softmax_tape(logits)
-        neg_one: int = tape_append_node(-1.0, (), ())
-        position_loss: int = tape_multiply(neg_one, tape_log(probs[target_id]))
+        position_loss: int = softmax_cross_entropy_tape(logits, target_id)
         losses.append(position_loss)
     total_loss_sum: int = losses[0]
     for position_loss in losses[1:]:
@@ -532,20 +587,25 @@ for step in range(num_steps):
     adjusted_learning_rate: float = (
         learning_rate * 0.5 * (1 + math.cos(math.pi * step / num_steps))
     )
-    for parameter_index in range(len(parameter_data)):
-        first_moment[parameter_index] = (
-            beta1 * first_moment[parameter_index]
-            + (1 - beta1) * tape_grad[parameter_index]
+    # Step-invariant factors are computed once, outside the per-parameter
+    # loop; each parameter then reads its gradient and moments once.
+    first_moment_bias_correction: float = 1 - beta1 ** (step + 1)
+    second_moment_bias_correction: float = 1 - beta2 ** (step + 1)
+    for parameter_index in range(parameter_count):
+        gradient: float = tape_grad[parameter_index]
+        first_moment_value: float = (
+            beta1 * first_moment[parameter_index] + one_minus_beta1 * gradient
         )
-        second_moment[parameter_index] = (
-            beta2 * second_moment[parameter_index]
-            + (1 - beta2) * tape_grad[parameter_index] ** 2
+        second_moment_value: float = (
+            beta2 * second_moment[parameter_index] + one_minus_beta2 * gradient**2
         )
-        first_moment_corrected: float = first_moment[parameter_index] / (
-            1 - beta1 ** (step + 1)
+        first_moment[parameter_index] = first_moment_value
+        second_moment[parameter_index] = second_moment_value
+        first_moment_corrected: float = (
+            first_moment_value / first_moment_bias_correction
         )
-        second_moment_corrected: float = second_moment[parameter_index] / (
-            1 - beta2 ** (step + 1)
+        second_moment_corrected: float = (
+            second_moment_value / second_moment_bias_correction
         )
         parameter_data[parameter_index] -= (
             adjusted_learning_rate
@@ -585,10 +645,18 @@ for step in range(num_steps):
 
 # Inference: may the model babble back to us
 temperature: float = 0.5
+
+# Parameters are final once training ends: read each float matrix once
+weight_matrix_float_table: dict[str, list[list[float]]] = {}
+for parameter_name in parameter_offset_table:
+    weight_matrix_float_table[parameter_name] = get_weight_matrix_float(parameter_name)
 print("\n--- inference ---")
 for sample_idx in range(20):
-    keys: list[list[list[float]]] = [[] for _ in range(number_of_layers)]
-    values: list[list[list[float]]] = [[] for _ in range(number_of_layers)]
+    keys: list[list[list[list[float]]]] = []
+    values: list[list[list[list[float]]]] = []
+    for _ in range(number_of_layers):
+        keys.append([[] for _ in range(number_of_heads)])
+        values.append([[] for _ in range(number_of_heads)])
     token_id: int = BOS
     sample: list[str] = []
     for position_index in range(block_size):
@@ -597,7 +665,15 @@ for sample_idx in range(20):
         for logit_value in logits:
             scaled_logits.append(logit_value / temperature)
         probs: list[float] = softmax_float(scaled_logits)
-        token_id = random.choices(range(vocab_size), weights=probs)[0]
+        # Invert the cumulative distribution: the same draw random.choices
+        # makes, without its per-call accumulate and population setup
+        cumulative_probs: list[float] = []
+        running_total: float = 0.0
+        for prob in probs:
+            running_total += prob
+            cumulative_probs.append(running_total)
+        threshold: float = random.random() * running_total
+        token_id = bisect.bisect(cumulative_probs, threshold, 0, vocab_size - 1)
         if token_id == BOS:
             break
         sample.append(token_to_character[token_id])